@@ -1,34 +1,92 @@
-from flask import Flask, request, jsonify, render_template
-from ml_model import model, feature_columns
-import numpy as np
+import time
+from flask import Flask, Response, g, request, jsonify, render_template
+from werkzeug.exceptions import HTTPException
+import os
+from metrics import REGISTRY, CONTENT_TYPE, REQUESTS, REQUEST_ERRORS, REQUEST_SECONDS, timed
+from model_loader import ModelLoader, ModelNotReady
+from columnar import COLUMNS_HEADER, UnsupportedFormat, is_columnar, parse_columnar, encode_columnar
+
+# ml_model loads in a background thread so /health answers at once;
+# EAGER_MODEL_LOAD=1 loads it before serving. New model files are picked
+# up every MODEL_WATCH_INTERVAL seconds (0 turns it off).
+models = ModelLoader().start(background=os.environ.get("EAGER_MODEL_LOAD", "0") != "1")
+models.watch(float(os.environ.get("MODEL_WATCH_INTERVAL", "10")))
+
+# When set, /admin/reload needs a matching X-Admin-Token header
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
 
 app = Flask(__name__, template_folder="../frontend")
 
+@app.before_request
+def start_timer():
+    g.start = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    # Label by route template, not raw path, so label values stay bounded
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    REQUESTS.inc(route=route, status=response.status_code)
+    REQUEST_SECONDS.observe(time.perf_counter() - g.start, route=route)
+    if response.status_code >= 400:
+        REQUEST_ERRORS.inc(route=route, error=response.status_code)
+
+    # Set by the routes from the model they actually scored with
+    if g.get("model_version") is not None:
+        response.headers["X-Model-Version"] = g.model_version
+    return response
+
+def error_response(e):
+    """
+    Keep the {"error": ...} body but with a real status code: 400 for bad
+    input, 415 for a body format we cannot read, 503 while the model
+    loads, 500 for anything else on our side
+    """
+    if isinstance(e, ModelNotReady):
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
+    if isinstance(e, UnsupportedFormat):
+        status = 415
+    elif isinstance(e, HTTPException):
+        status = e.code
+    elif isinstance(e, (ValueError, KeyError, TypeError)):
+        status = 400
+    else:
+        status = 500
+    return jsonify({"error": str(e)}), status
+
+@app.errorhandler(ModelNotReady)
+def model_not_ready(e):
+    return error_response(e)
+
 @app.route("/")
 def home():
     return render_template("index.html")
 
-@app.route("/predict", methods=["POST"])
-def predict():
-    try:
-        user_data = request.json
+@app.route("/health")
+def health():
+    return jsonify({"status": "ok"})
 
-        # Create full feature vector (26 features)
-        input_dict = {feature: 0 for feature in feature_columns}
+@app.route("/ready")
+def ready():
+    status = models.status()
+    return jsonify(status), 200 if status["ready"] else 503
 
-        # Map simple UI inputs to model features
-        input_dict["founded_year"] = float(user_data.get("founded_year", 0))
-        input_dict["funding_total_usd"] = float(user_data.get("funding_total_usd", 0))
-        input_dict["milestones"] = float(user_data.get("milestones", 0))
-        input_dict["relationships"] = float(user_data.get("relationships", 0))
-        input_dict["has_VC"] = int(user_data.get("has_VC", 0))
-        input_dict["has_angel"] = int(user_data.get("has_angel", 0))
+@app.route("/admin/reload", methods=["POST"])
+def reload_model():
+    if ADMIN_TOKEN is not None and request.headers.get("X-Admin-Token") != ADMIN_TOKEN:
+        return jsonify({"error": "Invalid admin token"}), 403
+    result = models.reload(force=request.args.get("force", "").lower() in ("1", "true"))
+    return jsonify(result), 500 if result["status"] == "failed" else 200
 
-        # Convert to ordered array (VERY IMPORTANT)
-        input_array = np.array([input_dict[col] for col in feature_columns]).reshape(1, -1)
+@app.route("/predict", methods=["POST"])
+def predict():
+    try:
+        ml = models.module
+        g.model_version = ml.model_version
+        with timed("validation"):
+            user_data = request.json
 
-        prediction = model.predict(input_array)[0]
-        probability = model.predict_proba(input_array)[0][1]
+        # Same transformer as training and the FastAPI backend
+        prediction, probability = ml.predict_startup(user_data)
 
         result = "Successful Startup 🚀" if prediction == 1 else "Failed Startup ❌"
 
@@ -38,7 +96,66 @@ def predict():
         })
 
     except Exception as e:
-        return jsonify({"error": str(e)})
+        return error_response(e)
+
+@app.route("/predict/batch", methods=["POST"])
+def predict_many():
+    try:
+        ml = models.module
+        g.model_version = ml.model_version
+
+        # Raw float32 / Arrow bodies: answered in the same format
+        if is_columnar(request.content_type):
+            with timed("validation"):
+                matrix = parse_columnar(request.get_data(), request.content_type,
+                                        request.headers.get(COLUMNS_HEADER), ml.transformer.columns_)
+            content, headers = encode_columnar(*ml.predict_columnar(matrix), request.content_type)
+            return Response(content, headers=headers)
+
+        with timed("validation"):
+            records = ml.parse_records(request.get_data(), request.content_type or "")
+        predictions, probabilities = ml.predict_batch(records)
+
+        return jsonify({
+            "count": len(records),
+            "results": [
+                {
+                    "prediction": "Successful Startup 🚀" if p == 1 else "Failed Startup ❌",
+                    "probability": round(prob * 100, 2)
+                }
+                for p, prob in zip(predictions, probabilities)
+            ]
+        })
+
+    except Exception as e:
+        return error_response(e)
+
+@app.route("/predict/sweep", methods=["POST"])
+def sweep():
+    try:
+        ml = models.module
+        g.model_version = ml.model_version
+        body = request.json
+        return jsonify(ml.predict_sweep(body.get("base", {}), body.get("sweep", {})))
+
+    except Exception as e:
+        return error_response(e)
+
+@app.route("/drift")
+def drift():
+    try:
+        return jsonify(models.module.drift_report())
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+
+@app.route("/metrics")
+def metrics():
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+@app.route("/metrics/cache")
+def cache_metrics():
+    return jsonify(models.module.prediction_cache.stats())
 
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,134 @@
+import io
+
+__all__ = ["RAW_CONTENT_TYPE", "ARROW_CONTENT_TYPE", "COLUMNS_HEADER", "UnsupportedFormat",
+           "is_columnar", "parse_columnar", "encode_columnar"]
+
+# Row-major little-endian float32 matrix; the X-Columns header names its
+# columns (comma-separated)
+RAW_CONTENT_TYPE = "application/x-float32-matrix"
+
+# Arrow IPC stream (needs pyarrow)
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+# Request and response columns are named in this HTTP header for raw bodies
+COLUMNS_HEADER = "X-Columns"
+
+RESULT_COLUMNS = ["prediction", "probability"]
+
+
+class UnsupportedFormat(ValueError):
+    """Raised for a columnar body this server cannot read (e.g. Arrow without pyarrow)."""
+
+
+def media_type(content_type):
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def is_columnar(content_type):
+    return media_type(content_type) in (RAW_CONTENT_TYPE, ARROW_CONTENT_TYPE)
+
+
+def column_order(columns, expected):
+    """
+    Position of each expected feature in the body's columns. The body must
+    carry exactly the model's features, in any order.
+    """
+    columns = list(columns)
+    if len(set(columns)) != len(columns):
+        raise ValueError("Duplicate columns in request")
+
+    missing = [c for c in expected if c not in columns]
+    unknown = [c for c in columns if c not in expected]
+    if missing or unknown:
+        raise ValueError("Columns must match feature_columns (missing: %s, unknown: %s)" % (
+            ", ".join(missing) or "none", ", ".join(unknown) or "none"))
+    return [columns.index(c) for c in expected]
+
+
+def parse_raw(body, columns_header, expected):
+    import numpy as np
+
+    if not columns_header:
+        raise ValueError("Raw float32 bodies need an %s header" % COLUMNS_HEADER)
+    columns = [c.strip() for c in columns_header.split(",")]
+    order = column_order(columns, expected)
+
+    if len(body) % (4 * len(columns)):
+        raise ValueError("Body is %d bytes, not a whole number of %d-column float32 rows" % (len(body), len(columns)))
+    matrix = np.frombuffer(body, dtype="<f4").reshape(-1, len(columns))
+
+    # Reordering copies; a body already in feature order is used as is
+    if order != list(range(len(columns))):
+        matrix = matrix[:, order]
+    return matrix
+
+
+def parse_arrow(body, expected):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise UnsupportedFormat("Arrow bodies need pyarrow on the server; send %s instead" % RAW_CONTENT_TYPE)
+    import numpy as np
+
+    try:
+        table = pa.ipc.open_stream(io.BytesIO(body)).read_all()
+    except pa.ArrowInvalid as e:
+        raise ValueError("Invalid Arrow stream: %s" % e)
+
+    order = column_order(table.column_names, expected)
+    matrix = np.empty((table.num_rows, len(expected)), dtype=np.float32)
+    for j, i in enumerate(order):
+        column = table.column(i)
+        if not (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+                or pa.types.is_boolean(column.type)):
+            raise ValueError("Column %s is %s, expected a numeric type" % (expected[j], column.type))
+        if column.null_count:
+            raise ValueError("Column %s has %d nulls" % (expected[j], column.null_count))
+        matrix[:, j] = column.to_numpy()
+    return matrix
+
+
+def parse_columnar(body, content_type, columns_header, expected):
+    """
+    (n, n_features) float32 matrix in `expected` column order from a raw
+    float32 or Arrow body. Checks are per column and on the whole matrix;
+    no per-row Python objects are created. NumPy (like pyarrow) is only
+    imported here, so importing the web apps stays light.
+    """
+    import numpy as np
+
+    if media_type(content_type) == RAW_CONTENT_TYPE:
+        matrix = parse_raw(body, columns_header, list(expected))
+    else:
+        matrix = parse_arrow(body, list(expected))
+
+    if len(matrix) == 0:
+        raise ValueError("Request has no rows")
+    finite = np.isfinite(matrix).all(axis=0)
+    if not finite.all():
+        bad = [c for c, ok in zip(expected, finite) if not ok]
+        raise ValueError("Columns with NaN or infinite values: %s" % ", ".join(bad))
+    return matrix
+
+
+def encode_columnar(predictions, probabilities, content_type):
+    """
+    Results in the request's format: a two-column float32 matrix
+    (prediction, probability) for raw bodies, an Arrow stream otherwise.
+    Returns (body, headers).
+    """
+    import numpy as np
+
+    if media_type(content_type) == RAW_CONTENT_TYPE:
+        matrix = np.column_stack([predictions, probabilities]).astype("<f4")
+        return matrix.tobytes(), {"Content-Type": RAW_CONTENT_TYPE, COLUMNS_HEADER: ",".join(RESULT_COLUMNS)}
+
+    import pyarrow as pa
+    table = pa.table({
+        "prediction": pa.array(np.asarray(predictions, dtype=np.int8)),
+        "probability": pa.array(np.asarray(probabilities, dtype=np.float64)),
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes(), {"Content-Type": ARROW_CONTENT_TYPE}
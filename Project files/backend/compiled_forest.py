@@ -0,0 +1,356 @@
+import json
+import os
+import shutil
+
+import numpy as np
+
+__all__ = ["CompiledForest"]
+
+# Node arrays written to / memory-mapped from an artifact directory
+ARRAY_NAMES = ["feature", "threshold", "left", "right", "missing_left", "value", "roots", "classes_"]
+META_FILE = "meta.json"
+
+# Rows walked at once; bounds the (trees x rows) scratch arrays for big batches
+CHUNK_ROWS = 4096
+
+
+class CompiledForest:
+    """
+    Array-backed copy of a fitted RandomForestClassifier.
+
+    Every tree is flattened into shared contiguous arrays (feature,
+    threshold, left, right, missing-value direction, leaf value) and all
+    trees are walked together, one depth level per step, so a prediction
+    costs a few NumPy calls instead of sklearn's per-estimator dispatch.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots,
+                 max_depth, classes, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features)
+        self.is_leaf = self.left == np.arange(len(self.left))
+        self._deltas = {}
+
+    @classmethod
+    def from_estimator(cls, forest):
+        """
+        Flatten the trees of a fitted forest into one set of node arrays
+        """
+        features, thresholds, lefts, rights, missing_lefts, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            is_leaf = tree.children_left == -1
+
+            # Leaves point back to themselves so the walk can keep stepping
+            # trees that are shallower than the deepest one
+            own = np.arange(n_nodes)
+            left = np.where(is_leaf, own, tree.children_left) + offset
+            right = np.where(is_leaf, own, tree.children_right) + offset
+
+            # Same normalisation sklearn applies in DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :].astype(np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+
+            # Where sklearn (>= 1.3) sends NaN at each split; older trees
+            # send it right, like a failed `x <= threshold`
+            missing = getattr(tree, "missing_go_to_left", None)
+            missing = np.zeros(n_nodes, dtype=bool) if missing is None else missing.astype(bool)
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(left)
+            rights.append(right)
+            missing_lefts.append(missing & ~is_leaf)
+            values.append(value / normalizer)
+            roots.append(offset)
+
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            missing_left=np.concatenate(missing_lefts),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            classes=np.asarray(forest.classes_),
+            n_features=forest.n_features_in_,
+        )
+
+    def compact(self, prune=True):
+        """
+        Smaller copy for shipping: int16 feature indices, int32 child
+        links, float32 thresholds and node values. Thresholds are rounded
+        toward -inf, which keeps `x <= threshold` exact for float32 inputs.
+        With prune, every subtree whose leaves all hold the same class
+        distribution collapses into one leaf; predictions are unchanged.
+        """
+        n_nodes = len(self.left)
+        is_leaf = self.is_leaf.copy()
+        value = np.array(self.value)
+        n_pruned = 0
+
+        if prune:
+            # Children always have higher ids than their parent, so one
+            # backwards pass collapses whole subtrees bottom-up
+            left, right = self.left, self.right
+            for node in range(n_nodes - 1, -1, -1):
+                if is_leaf[node]:
+                    continue
+                l, r = left[node], right[node]
+                if is_leaf[l] and is_leaf[r] and np.array_equal(value[l], value[r]):
+                    is_leaf[node] = True
+                    value[node] = value[l]
+                    n_pruned += 1
+
+        # Keep only nodes still reachable from a root (forward pass)
+        reachable = np.zeros(n_nodes, dtype=bool)
+        reachable[self.roots] = True
+        for node in range(n_nodes):
+            if reachable[node] and not is_leaf[node]:
+                reachable[self.left[node]] = True
+                reachable[self.right[node]] = True
+
+        new_id = np.cumsum(reachable) - 1
+        kept = np.flatnonzero(reachable)
+        kept_leaf = is_leaf[kept]
+
+        threshold = self.threshold[kept].astype(np.float32)
+        too_high = threshold.astype(np.float64) > self.threshold[kept]
+        threshold[too_high] = np.nextafter(threshold[too_high], np.float32(-np.inf))
+
+        own = np.arange(len(kept))
+        forest = CompiledForest(
+            feature=np.where(kept_leaf, 0, self.feature[kept]).astype(np.int16),
+            threshold=threshold,
+            left=np.where(kept_leaf, own, new_id[self.left[kept]]).astype(np.int32),
+            right=np.where(kept_leaf, own, new_id[self.right[kept]]).astype(np.int32),
+            missing_left=self.missing_left[kept],
+            # Internal node values are kept for explain()
+            value=value[kept].astype(np.float32),
+            roots=new_id[self.roots].astype(np.int32),
+            max_depth=self.max_depth,
+            classes=self.classes_,
+            n_features=self.n_features_in_,
+        )
+        forest.n_pruned = n_pruned
+        return forest
+
+    def save_npz(self, path, **meta):
+        """
+        Write the node arrays and meta into a single compressed .npz
+        (written next to `path` and renamed into place)
+        """
+        meta.update(max_depth=self.max_depth, n_features=self.n_features_in_)
+        tmp_path = "%s.tmp-%d.npz" % (path, os.getpid())
+
+        np.savez_compressed(
+            tmp_path,
+            meta=np.array(json.dumps(meta)),
+            **{name: np.ascontiguousarray(getattr(self, name)) for name in ARRAY_NAMES}
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_npz(cls, path):
+        """
+        Load an artifact written by save_npz(). Returns (forest, meta).
+        """
+        with np.load(path) as bundle:
+            meta = json.loads(str(bundle["meta"]))
+            arrays = {name: bundle[name] for name in ARRAY_NAMES}
+
+        forest = cls(
+            max_depth=meta["max_depth"],
+            classes=arrays.pop("classes_"),
+            n_features=meta["n_features"],
+            **arrays
+        )
+        return forest, meta
+
+    def save(self, path, **meta):
+        """
+        Write the node arrays as raw .npy files plus a meta.json sidecar.
+        The directory is written under a temporary name and renamed into
+        place, so concurrent workers never see a half-written artifact.
+        """
+        tmp_path = "%s.tmp-%d" % (path, os.getpid())
+        os.makedirs(tmp_path, exist_ok=True)
+
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(tmp_path, name + ".npy"), np.ascontiguousarray(getattr(self, name)))
+
+        meta.update(max_depth=self.max_depth, n_features=self.n_features_in_)
+        with open(os.path.join(tmp_path, META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        shutil.rmtree(path, ignore_errors=True)
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # Another worker renamed its copy first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """
+        Load an artifact written by save(). With mmap_mode="r" the arrays are
+        read-only views of the page cache, shared by every process that maps
+        the same files. Returns (forest, meta).
+        """
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+
+        arrays = {
+            name: np.asarray(np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode))
+            for name in ARRAY_NAMES
+        }
+
+        forest = cls(
+            feature=arrays["feature"],
+            threshold=arrays["threshold"],
+            left=arrays["left"],
+            right=arrays["right"],
+            missing_left=arrays["missing_left"],
+            value=arrays["value"],
+            roots=arrays["roots"],
+            max_depth=meta["max_depth"],
+            classes=arrays["classes_"],
+            n_features=meta["n_features"],
+        )
+        return forest, meta
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    def _go_left(self, x, nodes):
+        """
+        Split decision for feature values `x` at `nodes`: x <= threshold,
+        or the learned missing-value direction when x is NaN
+        """
+        go_left = x <= self.threshold[nodes]
+        missing = np.isnan(x)
+        if missing.any():
+            go_left[missing] = self.missing_left[nodes[missing]]
+        return go_left
+
+    def apply(self, X):
+        """
+        Return the leaf index reached by every (tree, row) pair
+        """
+        # sklearn compares float32 inputs against float64 thresholds
+        # (compact artifacts store the equivalent float32 thresholds)
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+
+        # Walk every (tree, row) pair one level per step, dropping pairs
+        # once they reach a leaf so the cost follows the real path lengths
+        nodes = np.repeat(self.roots, n_rows)
+        row_offsets = np.tile(np.arange(n_rows) * n_features, self.n_estimators)
+        active = np.arange(nodes.size)
+        current = nodes[active]
+
+        while active.size:
+            go_left = self._go_left(flat_X[row_offsets + self.feature[current]], current)
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+
+            still_walking = ~self.is_leaf[current]
+            active = active[still_walking]
+            row_offsets = row_offsets[still_walking]
+            current = current[still_walking]
+
+        return nodes.reshape(self.n_estimators, n_rows)
+
+    def predict_proba(self, X):
+        """
+        Average the leaf class distributions over all trees
+        """
+        if len(X) > CHUNK_ROWS:
+            return np.concatenate([
+                self.predict_proba(X[start:start + CHUNK_ROWS])
+                for start in range(0, len(X), CHUNK_ROWS)
+            ])
+
+        leaf_values = self.value[self.apply(X)]
+
+        # Accumulate tree by tree (axis 0) to match the forest's summation
+        # order, in float64 even when a compact artifact stores float32
+        proba = np.add.reduce(leaf_values, axis=0, dtype=np.float64)
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def node_deltas(self, class_index=1):
+        """
+        Per-node table for explain(): how much the probability of
+        classes_[class_index] changes between a node's parent and the node
+        (0 at the roots). Computed once per class and reused.
+        """
+        if class_index not in self._deltas:
+            internal = np.flatnonzero(~self.is_leaf)
+            parent = np.arange(len(self.left))
+            parent[self.left[internal]] = internal
+            parent[self.right[internal]] = internal
+
+            value = np.asarray(self.value[:, class_index], dtype=np.float64)
+            self._deltas[class_index] = value - value[parent]
+        return self._deltas[class_index]
+
+    def explain(self, X, class_index=1):
+        """
+        Saabas decomposition of the classes_[class_index] probability:
+        every step down a tree credits the change in node value to the
+        feature that was split on. Returns (bias, contributions) with
+        bias + contributions.sum(axis=1) == predict_proba(X)[:, class_index].
+        """
+        if len(X) > CHUNK_ROWS:
+            parts = [self.explain(X[start:start + CHUNK_ROWS], class_index)
+                     for start in range(0, len(X), CHUNK_ROWS)]
+            return parts[0][0], np.concatenate([c for _, c in parts])
+
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        deltas = self.node_deltas(class_index)
+
+        # Same level-by-level walk as apply(), adding each step's delta to
+        # the (row, split feature) cell of a flat contribution table
+        contributions = np.zeros(n_rows * n_features)
+        rows = np.tile(np.arange(n_rows), self.n_estimators)
+        current = np.repeat(self.roots, n_rows)
+
+        while current.size:
+            split_feature = self.feature[current]
+            go_left = self._go_left(flat_X[rows * n_features + split_feature], current)
+            current = np.where(go_left, self.left[current], self.right[current])
+
+            contributions += np.bincount(rows * n_features + split_feature,
+                                         weights=deltas[current], minlength=contributions.size)
+
+            still_walking = ~self.is_leaf[current]
+            rows = rows[still_walking]
+            current = current[still_walking]
+
+        bias = float(np.mean(self.value[self.roots, class_index], dtype=np.float64))
+        return bias, contributions.reshape(n_rows, n_features) / self.n_estimators
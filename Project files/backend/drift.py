@@ -0,0 +1,129 @@
+import json
+import threading
+
+import numpy as np
+
+__all__ = ["DriftMonitor", "build_reference", "save_reference"]
+
+# Quantile bins per continuous feature
+DEFAULT_BINS = 10
+
+# Keeps log() finite for bins that are empty on one side
+EPSILON = 1e-4
+
+# Conventional PSI reading
+PSI_LEVELS = [(0.1, "stable"), (0.25, "moderate"), (float("inf"), "drifted")]
+
+
+def build_reference(matrix, columns, n_bins=DEFAULT_BINS):
+    """
+    Reference sketch of the training matrix: for continuous features the
+    inner quantile edges and the share of rows in each bin, for 0/1 flags
+    the share of ones
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    features = []
+
+    for j, col in enumerate(columns):
+        values = matrix[:, j]
+        if np.isin(values, [0.0, 1.0]).all():
+            features.append({"name": col, "kind": "flag", "p": [float(1 - values.mean()), float(values.mean())]})
+            continue
+
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        features.append({
+            "name": col,
+            "kind": "continuous",
+            "edges": edges.tolist(),
+            "p": (counts / counts.sum()).tolist(),
+        })
+
+    return {"rows": int(len(matrix)), "features": features}
+
+
+def save_reference(path, reference):
+    with open(path, "w") as f:
+        json.dump(reference, f, indent=2)
+
+
+class DriftMonitor:
+    """
+    Streaming drift check of request feature vectors against the training
+    reference. Every feature keeps a fixed number of bin counters (the
+    reference quantile bins, or 0/1 for flags), so memory does not grow
+    with traffic and an update is one comparison and one bincount for the
+    whole batch.
+    """
+
+    def __init__(self, reference):
+        self.reference = reference
+        self.names = [f["name"] for f in reference["features"]]
+        n_features = len(self.names)
+
+        # Every feature gets the same number of slots: its edges padded
+        # with +inf, so bin = number of edges below the value
+        width = max(len(f.get("edges", [0.5])) for f in reference["features"])
+        self.edges = np.full((n_features, width), np.inf)
+        self.expected = np.zeros((n_features, width + 1))
+        for j, feature in enumerate(reference["features"]):
+            edges = feature.get("edges", [0.5])
+            self.edges[j, :len(edges)] = edges
+            self.expected[j, :len(feature["p"])] = feature["p"]
+
+        self.n_slots = width + 1
+        self.offsets = np.arange(n_features) * self.n_slots
+        self.counts = np.zeros(n_features * self.n_slots, dtype=np.int64)
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def observe(self, matrix):
+        """
+        Add a batch of feature vectors (rows x features) to the counters
+        """
+        matrix = np.asarray(matrix)
+        # Flags use edge 0.5; a value equal to an edge goes to the upper bin,
+        # like searchsorted(side="right") in build_reference
+        bins = (matrix[:, :, np.newaxis] >= self.edges).sum(axis=2)
+        slots = np.bincount((bins + self.offsets).ravel(), minlength=self.counts.size)
+
+        with self._lock:
+            self.counts += slots
+            self.rows += len(matrix)
+
+    def reset(self):
+        with self._lock:
+            self.counts[:] = 0
+            self.rows = 0
+
+    def report(self):
+        """
+        Population stability index per feature, worst first
+        """
+        with self._lock:
+            counts = self.counts.reshape(len(self.names), self.n_slots).astype(np.float64)
+            rows = self.rows
+
+        if rows == 0:
+            return {"rows": 0, "features": []}
+
+        actual = np.maximum(counts / rows, EPSILON)
+        expected = np.maximum(self.expected, EPSILON)
+        used = (self.expected > 0) | (counts > 0)
+        psi = np.where(used, (actual - expected) * np.log(actual / expected), 0.0).sum(axis=1)
+
+        features = [
+            {
+                "feature": name,
+                "psi": float(score),
+                "level": next(label for bound, label in PSI_LEVELS if score < bound),
+            }
+            for name, score in zip(self.names, psi)
+        ]
+        features.sort(key=lambda f: f["psi"], reverse=True)
+        return {"rows": rows, "reference_rows": self.reference["rows"], "features": features}
@@ -1,12 +1,62 @@
-from fastapi import FastAPI
+import os
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional
-from ml_model import predict_startup
+from pydantic import BaseModel, Field, ValidationError
+from typing import Dict, List, Optional, Union
+from fastapi.responses import JSONResponse
+from micro_batcher import MicroBatcher, QueueFullError, BatcherStoppedError
+from columnar import COLUMNS_HEADER, UnsupportedFormat, is_columnar, parse_columnar, encode_columnar
+from metrics import REGISTRY, CONTENT_TYPE, REQUESTS, REQUEST_ERRORS, REQUEST_SECONDS, timed
+from model_loader import ModelLoader, ModelNotReady
+
+# ml_model (NumPy, joblib, model artifacts) loads in a background thread so
+# /health answers at once; EAGER_MODEL_LOAD=1 loads it before serving
+EAGER_MODEL_LOAD = os.environ.get("EAGER_MODEL_LOAD", "0") == "1"
+
+# New model files in models/ are picked up every MODEL_WATCH_INTERVAL
+# seconds (0 turns it off; POST /admin/reload works either way)
+MODEL_WATCH_INTERVAL = float(os.environ.get("MODEL_WATCH_INTERVAL", "10"))
+
+# When set, /admin/reload needs a matching X-Admin-Token header
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+models = ModelLoader().start(background=not EAGER_MODEL_LOAD).watch(MODEL_WATCH_INTERVAL)
+
+def predict_rows(items):
+    """
+    Score a micro-batch of (model module, record) pairs. Each request is
+    queued with the model it started on, so requests queued across a
+    reload still get the old version; normally that is one model call.
+    """
+    predictions, probabilities = [None] * len(items), [None] * len(items)
+    for ml in {id(ml): ml for ml, _ in items}.values():
+        index = [i for i, (m, _) in enumerate(items) if m is ml]
+        scored = ml.predict_batch([items[i][1] for i in index])
+        for i, prediction, probability in zip(index, *scored):
+            predictions[i], probabilities[i] = prediction, probability
+    return predictions, probabilities
+
+# Concurrent /predict calls are coalesced into one model call
+batcher = MicroBatcher(
+    predict_rows,
+    max_batch_size=int(os.environ.get("BATCH_MAX_SIZE", 64)),
+    max_wait_ms=float(os.environ.get("BATCH_MAX_WAIT_MS", 5)),
+    max_queue_size=int(os.environ.get("BATCH_MAX_QUEUE", 1024)),
+)
+
+@asynccontextmanager
+async def lifespan(app):
+    await batcher.start()
+    yield
+    await batcher.stop()
 
 app = FastAPI(
     title="Prosperity Prognosticator API",
-    version="1.0"
+    version="1.0",
+    lifespan=lifespan
 )
 
 # Enable CORS (for frontend connection)
@@ -18,6 +68,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(ModelNotReady)
+async def model_not_ready(request: Request, exc: ModelNotReady):
+    return JSONResponse({"detail": str(exc)}, status_code=503, headers={"Retry-After": "1"})
+
+@app.middleware("http")
+async def record_request(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Unhandled exceptions still count, as the 500 the client gets.
+        # Label by route template, not raw path, so label values stay bounded
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        REQUESTS.inc(route=route, status=status)
+        REQUEST_SECONDS.observe(time.perf_counter() - start, route=route)
+        if status >= 400:
+            REQUEST_ERRORS.inc(route=route, error=status)
+
 class StartupData(BaseModel):
     founded_year: int
     funding_total_usd: float
@@ -30,11 +101,182 @@ class StartupData(BaseModel):
     has_roundC: bool = False
     has_roundD: bool = False
 
+# Same limit as ml_model.MAX_SWEEP_POINTS (ml_model loads in the background)
+MAX_SWEEP_POINTS = 10_000
+
+class SweepRange(BaseModel):
+    start: float
+    stop: float
+    num: int = Field(20, ge=1, le=MAX_SWEEP_POINTS)
+
+class SweepRequest(BaseModel):
+    base: StartupData
+    sweep: Dict[str, Union[List[float], SweepRange]]
+
 @app.get("/")
 def home():
     return {"message": "Startup Success Predictor API Running 🚀"}
 
+@app.get("/health")
+def health():
+    """
+    Liveness: the process is up (answers while the model is still loading)
+    """
+    return {"status": "ok"}
+
+@app.get("/ready")
+def ready():
+    """
+    Readiness: 200 once the model is loaded and warmed up, 503 before
+    """
+    status = models.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+@app.post("/admin/reload")
+def reload_model(request: Request, force: bool = False):
+    """
+    Load the model files again, check them on held-out rows and swap them
+    in; the old model keeps serving if they fail
+    """
+    if ADMIN_TOKEN is not None and request.headers.get("x-admin-token") != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    result = models.reload(force=force)
+    return JSONResponse(result, status_code=500 if result["status"] == "failed" else 200)
+
 @app.post("/predict")
-def predict(data: StartupData):
-    result = predict_startup(data.dict())
-    return result
\ No newline at end of file
+async def predict(data: StartupData, response: Response):
+    # 503 before queueing anything while the model loads
+    ml = models.module
+    try:
+        result = await batcher.submit((ml, data.dict()))
+    except (QueueFullError, BatcherStoppedError) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    response.headers["X-Model-Version"] = ml.model_version
+    return result
+
+async def predict_columnar(ml, request, body):
+    """
+    Raw float32 or Arrow body in, the same format out; the columns are
+    checked against feature_columns and the matrix goes straight to the model
+    """
+    content_type = request.headers.get("content-type", "")
+    try:
+        with timed("validation"):
+            matrix = parse_columnar(body, content_type, request.headers.get(COLUMNS_HEADER),
+                                    ml.transformer.columns_)
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    predictions, probabilities = await run_in_threadpool(ml.predict_columnar, matrix)
+    content, headers = encode_columnar(predictions, probabilities, content_type)
+    headers["X-Model-Version"] = ml.model_version
+    return Response(content, headers=headers)
+
+@app.post("/predict/batch")
+async def predict_many(request: Request, response: Response):
+    """
+    Score a JSON array or NDJSON body of StartupData records in one model
+    call; high-volume clients can send a raw float32 matrix or an Arrow
+    stream of feature columns instead
+    """
+    ml = models.module
+    body = await request.body()
+    if is_columnar(request.headers.get("content-type")):
+        return await predict_columnar(ml, request, body)
+
+    try:
+        with timed("validation"):
+            records = ml.parse_records(body, request.headers.get("content-type", ""))
+            rows = [StartupData(**record).dict() for record in records]
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    predictions, probabilities = await run_in_threadpool(ml.predict_batch, rows)
+
+    response.headers["X-Model-Version"] = ml.model_version
+    return {
+        "count": len(rows),
+        "predictions": predictions,
+        "probabilities": probabilities
+    }
+
+@app.post("/predict/sweep")
+def sweep(request: SweepRequest, response: Response):
+    """
+    Probability curve (one field) or grid (two fields) around a base record
+    """
+    ml = models.module
+    axes = {
+        field: spec.dict() if isinstance(spec, SweepRange) else spec
+        for field, spec in request.sweep.items()
+    }
+    response.headers["X-Model-Version"] = ml.model_version
+    try:
+        return ml.predict_sweep(request.base.dict(), axes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/explain")
+def explain(data: StartupData, response: Response, top_k: int = 5):
+    """
+    Why the model gave this probability: base value plus the top_k
+    per-feature contributions (Saabas decomposition over all trees)
+    """
+    ml = models.module
+    response.headers["X-Model-Version"] = ml.model_version
+    try:
+        return ml.explain_batch([data.dict()], top_k)[0]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/explain/batch")
+async def explain_many(request: Request, response: Response, top_k: int = 5):
+    """
+    Explanations for a JSON array or NDJSON body of StartupData records
+    """
+    ml = models.module
+    body = await request.body()
+
+    try:
+        with timed("validation"):
+            records = ml.parse_records(body, request.headers.get("content-type", ""))
+            rows = [StartupData(**record).dict() for record in records]
+        explanations = await run_in_threadpool(ml.explain_batch, rows, top_k)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response.headers["X-Model-Version"] = ml.model_version
+    return {"count": len(rows), "explanations": explanations}
+
+@app.get("/drift")
+def drift():
+    """
+    Population stability index of each feature in the traffic seen so far
+    against the training data (< 0.1 stable, > 0.25 drifted)
+    """
+    try:
+        return models.module.drift_report()
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/metrics")
+def metrics():
+    """
+    Prometheus scrape endpoint
+    """
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+@app.get("/metrics/batcher")
+def batcher_metrics():
+    return batcher.stats()
+
+
+@app.get("/metrics/cache")
+def cache_metrics():
+    return models.module.prediction_cache.stats()
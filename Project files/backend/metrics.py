@@ -0,0 +1,204 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+__all__ = ["Counter", "Gauge", "Histogram", "Registry", "REGISTRY", "CONTENT_TYPE",
+           "REQUESTS", "REQUEST_ERRORS", "REQUEST_SECONDS", "STAGE_SECONDS",
+           "BATCHES", "BATCH_ROWS", "MODEL_LOAD_SECONDS", "TIME_TO_READY_SECONDS",
+           "MODEL_INFO", "MODEL_RELOADS", "PREDICTION_CACHE_METRICS", "timed"]
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from 50 microseconds (a cached hit) to 2.5s
+LATENCY_BUCKETS = [0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+BATCH_ROW_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 1024, 4096]
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ('%s="%s"' % (n, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+             for n, v in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        self._function = None
+
+    def set_function(self, function):
+        """
+        Read the (unlabelled) value from a callable at scrape time, for
+        numbers another object already tracks, like the cache counters
+        """
+        self._function = function
+
+    def clear(self):
+        """
+        Drop every label set, e.g. the info labels of a replaced model
+        """
+        with self._lock:
+            self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError("%s expects labels %s" % (self.name, self.labelnames))
+        return tuple(labels[n] for n in self.labelnames)
+
+    def render(self):
+        lines = ["# HELP %s %s" % (self.name, self.documentation),
+                 "# TYPE %s %s" % (self.name, self.kind)]
+        with self._lock:
+            if self._function is not None:
+                self._values = {(): self._function()}
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return ["%s%s %r" % (self.name, _format_labels(self.labelnames, key), float(value))]
+
+
+class Counter(_Metric):
+    """
+    Monotonic count, e.g. requests served
+    """
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down, e.g. model load time
+    """
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """
+    Cumulative-bucket histogram. observe() is one bisect and a few integer
+    adds under a lock, cheap enough to leave on for every request.
+    """
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = list(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # per-bucket counts (+Inf last), sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_sample(self, key, state):
+        counts, total, count = state
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets + ["+Inf"], counts):
+            cumulative += n
+            labels = _format_labels(self.labelnames + ("le",), key + (bound,))
+            lines.append("%s_bucket%s %d" % (self.name, labels, cumulative))
+        labels = _format_labels(self.labelnames, key)
+        lines.append("%s_sum%s %r" % (self.name, labels, total))
+        lines.append("%s_count%s %d" % (self.name, labels, count))
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ---------------------------------------------------
+# Serving metrics shared by main.py, app.py and ml_model
+# ---------------------------------------------------
+
+REQUESTS = REGISTRY.register(Counter(
+    "prosperity_requests_total", "HTTP requests by route and status code",
+    ["route", "status"]))
+REQUEST_ERRORS = REGISTRY.register(Counter(
+    "prosperity_request_errors_total", "Failed requests (status >= 400) by route and status code",
+    ["route", "error"]))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "prosperity_request_seconds", "End-to-end request latency", ["route"]))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "prosperity_stage_seconds",
+    "Latency of each serving stage (validation, features, inference)", ["stage"]))
+BATCHES = REGISTRY.register(Counter(
+    "prosperity_batches_total", "Calls into the model (one per request or micro-batch)"))
+BATCH_ROWS = REGISTRY.register(Histogram(
+    "prosperity_batch_rows", "Rows scored per model call", buckets=BATCH_ROW_BUCKETS))
+MODEL_LOAD_SECONDS = REGISTRY.register(Gauge(
+    "prosperity_model_load_seconds", "Time spent loading the model being served"))
+TIME_TO_READY_SECONDS = REGISTRY.register(Gauge(
+    "prosperity_time_to_ready_seconds", "Process start of the web app to model loaded and warmed up"))
+MODEL_INFO = REGISTRY.register(Gauge(
+    "prosperity_model_info", "Model being served (value is always 1)",
+    ["version", "engine"]))
+MODEL_RELOADS = REGISTRY.register(Counter(
+    "prosperity_model_reloads_total", "Hot reload attempts by result (reloaded, unchanged, failed)",
+    ["result"]))
+
+# Read from the serving model's prediction cache at scrape time; ml_model
+# points them at its cache when it starts serving
+PREDICTION_CACHE_METRICS = {
+    name: REGISTRY.register(kind("prosperity_prediction_cache_" + name + ("_total" if kind is Counter else ""), doc))
+    for name, kind, doc in [
+        ("hits", Counter, "Predictions answered from the cache"),
+        ("misses", Counter, "Rows that had to go through the model"),
+        ("evictions", Counter, "Entries dropped to stay under the size limit"),
+        ("expirations", Counter, "Entries dropped after their TTL"),
+        ("size", Gauge, "Entries currently cached"),
+    ]
+}
+
+
+@contextmanager
+def timed(stage):
+    """
+    Record the duration of a block under prosperity_stage_seconds{stage=...}
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
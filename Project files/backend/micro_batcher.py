@@ -0,0 +1,179 @@
+import asyncio
+import time
+
+__all__ = ["MicroBatcher", "QueueFullError", "BatcherStoppedError"]
+
+# Histogram bucket upper bounds
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+QUEUE_WAIT_BUCKETS_MS = [0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500]
+
+
+class QueueFullError(Exception):
+    """Raised when the batcher queue is at capacity (caller should shed load)."""
+
+
+class BatcherStoppedError(Exception):
+    """Raised for requests still waiting (or submitted) after the batcher stopped."""
+
+
+def _bucket(value, bounds):
+    for bound in bounds:
+        if value <= bound:
+            return bound
+    return "+Inf"
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-record predictions into one model call.
+
+    Requests are queued and flushed as one batch when max_batch_size records
+    are waiting or the oldest one has waited max_wait_ms, whichever comes
+    first. A request that finds nothing else queued is flushed at once, so
+    low traffic pays no batching delay; requests arriving while a batch is
+    scored queue up and form the next one. The batch function runs in the
+    default thread pool and each waiting request gets its own
+    (prediction, probability) back.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=5, max_queue_size=1024):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+
+        self._queue = None
+        self._task = None
+        self._in_flight = []
+
+        self.requests = 0
+        self.rejected = 0
+        self.batches = 0
+        self.errors = 0
+        self.batch_sizes = {bound: 0 for bound in BATCH_SIZE_BUCKETS + ["+Inf"]}
+        self.queue_waits = {bound: 0 for bound in QUEUE_WAIT_BUCKETS_MS + ["+Inf"]}
+        self.queue_wait_total_ms = 0.0
+        self.queue_wait_max_ms = 0.0
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Cancel the flush loop and fail every request it will not answer
+        (the batch being scored and everything still queued)
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        pending = [future for _, future, _ in self._in_flight]
+        self._in_flight = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait()[1])
+
+        for future in pending:
+            if not future.done():
+                future.set_exception(BatcherStoppedError("Server is shutting down"))
+
+    async def submit(self, record):
+        """
+        Queue one record and wait for its (prediction, probability)
+        """
+        if self._queue is None:
+            raise RuntimeError("MicroBatcher.start() has not been called")
+        if self._task is None:
+            raise BatcherStoppedError("Server is shutting down")
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((record, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError("Prediction queue is full (%d pending)" % self.max_queue_size)
+
+        self.requests += 1
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            # Only wait for company when other requests are already queued;
+            # no batch is in flight here, as each one is awaited below
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            while 1 < len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush(loop, batch)
+
+    async def _flush(self, loop, batch):
+        flushed_at = time.perf_counter()
+        for _, _, queued_at in batch:
+            self._record_wait((flushed_at - queued_at) * 1000)
+
+        self.batches += 1
+        self.batch_sizes[_bucket(len(batch), BATCH_SIZE_BUCKETS)] += 1
+
+        # Kept until the model call returns; if stop() cancels the loop
+        # meanwhile, it fails these requests
+        records = [record for record, _, _ in batch]
+        self._in_flight = batch
+        try:
+            predictions, probabilities = await loop.run_in_executor(None, self.predict_fn, records)
+        except Exception as e:
+            self._in_flight = []
+            self.errors += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self._in_flight = []
+
+        for (_, future, _), prediction, probability in zip(batch, predictions, probabilities):
+            # The client may have gone away while the batch was running
+            if not future.done():
+                future.set_result((prediction, probability))
+
+    def _record_wait(self, wait_ms):
+        self.queue_waits[_bucket(wait_ms, QUEUE_WAIT_BUCKETS_MS)] += 1
+        self.queue_wait_total_ms += wait_ms
+        self.queue_wait_max_ms = max(self.queue_wait_max_ms, wait_ms)
+
+    def stats(self):
+        flushed = sum(self.queue_waits.values())
+        return {
+            "config": {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "max_queue_size": self.max_queue_size,
+            },
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "errors": self.errors,
+            "mean_batch_size": flushed / self.batches if self.batches else 0.0,
+            "batch_size_histogram": {str(k): v for k, v in self.batch_sizes.items()},
+            "queue_wait_ms": {
+                "mean": self.queue_wait_total_ms / flushed if flushed else 0.0,
+                "max": self.queue_wait_max_ms,
+                "histogram": {str(k): v for k, v in self.queue_waits.items()},
+            },
+        }
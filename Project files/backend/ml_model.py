@@ -1,55 +1,456 @@
+import hashlib
 import joblib
+import json
 import numpy as np
 import os
+import sys
+import time
+
+from compiled_forest import CompiledForest
+from metrics import (BATCHES, BATCH_ROWS, MODEL_INFO, MODEL_LOAD_SECONDS,
+                     PREDICTION_CACHE_METRICS, timed)
+from prediction_cache import PredictionCache
+from drift import DriftMonitor
 
 __all__ = ["model", "feature_columns"]
 
 # Get project root (one level above backend)
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
-MODEL_PATH = os.path.join(BASE_DIR, "models", "model.pkl")
-FEATURE_PATH = os.path.join(BASE_DIR, "models", "feature_columns.pkl")
+# Every artifact below is read from MODEL_DIR (models/ by default)
+MODEL_DIR = os.environ.get("MODEL_DIR", os.path.join(BASE_DIR, "models"))
+
+# MODEL_FILE=startup_success_model.pkl serves train.py's output directly
+MODEL_PATH = os.path.join(MODEL_DIR, os.environ.get("MODEL_FILE", "model.pkl"))
+FEATURE_PATH = os.path.join(MODEL_DIR, "feature_columns.pkl")
+TRANSFORMER_PATH = os.path.join(MODEL_DIR, "feature_transformer.pkl")
+
+# The feature transformer lives with the training pipeline in src/
+# (the module is executed again on every hot reload, see model_loader.py)
+if os.path.join(BASE_DIR, "src") not in sys.path:
+    sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+from feature_transformer import FeatureTransformer
+
+# Memory-mappable .npy bundle of the compiled forest, rebuilt from
+# MODEL_PATH whenever the pickle changes
+COMPILED_PATH = os.path.join(MODEL_DIR, "model_compiled")
+
+# Compressed, pruned serving artifact exported by train.py; used instead of
+# unpickling model.pkl when it was exported from the same pickle
+COMPACT_PATH = os.path.join(MODEL_DIR, "model_compact.npz")
+
+# Training-set feature distributions saved by train.py
+DRIFT_REFERENCE_PATH = os.path.join(MODEL_DIR, "drift_reference.json")
+
+_load_start = time.perf_counter()
 
 print("Loading Model From:", MODEL_PATH)
 print("Loading Features From:", FEATURE_PATH)
 
-# Load model and feature columns
-model = joblib.load(MODEL_PATH)
+# Compiled inference: walk flattened tree arrays instead of calling sklearn
+# per request (set COMPILED_INFERENCE=0 to use the stock predict_proba)
+COMPILED_INFERENCE = os.environ.get("COMPILED_INFERENCE", "1") != "0"
+
+# Share one read-only copy of the node arrays between workers through the
+# page cache (set MODEL_MMAP=0 to keep a private in-memory copy)
+MODEL_MMAP = os.environ.get("MODEL_MMAP", "1") != "0"
+
+# Repeated /predict inputs are answered from an LRU cache of recent feature
+# vectors (PREDICTION_CACHE_SIZE=0 turns it off)
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL = float(os.environ.get("PREDICTION_CACHE_TTL", "300"))
+
+_model = None
+
+
+def file_digest(path):
+    """
+    SHA-256 of a file, used to tell whether a derived artifact is stale
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_sklearn_model():
+    """
+    Unpickle the sklearn model (only needed when no compiled artifact is usable)
+    """
+    global _model
+    if _model is None:
+        _model = joblib.load(MODEL_PATH)
+    return _model
+
+
+def __getattr__(name):
+    # `from ml_model import model` keeps working, but only pays for the
+    # unpickle when the sklearn object is actually requested
+    if name == "model":
+        return load_sklearn_model()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def share_forest(forest, model_digest, source):
+    """
+    With MODEL_MMAP, write `forest` as the .npy bundle and map it back, so
+    every worker reads one copy of the node arrays from the page cache
+    """
+    if not MODEL_MMAP:
+        return forest, source
+    try:
+        forest.save(COMPILED_PATH, source_sha256=model_digest)
+        forest, _ = CompiledForest.load(COMPILED_PATH, mmap_mode="r")
+    except OSError as e:
+        print("Could not write compiled model bundle:", e)
+        return forest, source
+    return forest, "memory-mapped, %s" % source
+
+
+def load_compiled_model(model_digest):
+    """
+    First match for model.pkl, in order: the memory-mapped bundle (with
+    MODEL_MMAP), the compact artifact, the pickled forest compiled here.
+    model_compact.npz is compressed and cannot be mapped, so with MODEL_MMAP
+    the first worker to load it (or the pickle) writes the bundle the
+    others map. Returns (forest, source).
+    """
+    if MODEL_MMAP and os.path.isdir(COMPILED_PATH):
+        try:
+            forest, meta = CompiledForest.load(COMPILED_PATH, mmap_mode="r")
+            if meta.get("source_sha256") == model_digest:
+                return forest, "memory-mapped"
+        except (OSError, ValueError, KeyError):
+            pass
+
+    if os.path.exists(COMPACT_PATH):
+        try:
+            forest, meta = CompiledForest.load_npz(COMPACT_PATH)
+            if meta.get("source_sha256") == model_digest:
+                return share_forest(forest, model_digest, "compact artifact")
+            print("model_compact.npz was exported from a different model.pkl, ignoring it")
+        except (OSError, ValueError, KeyError):
+            pass
+
+    sklearn_model = load_sklearn_model()
+    if not hasattr(sklearn_model, "estimators_"):
+        return None, None
+
+    forest = CompiledForest.from_estimator(sklearn_model)
+    return share_forest(forest, model_digest, "compiled from the pickle")
+
+
+# Load feature columns and model
 feature_columns = joblib.load(FEATURE_PATH)
 
+model_digest = file_digest(MODEL_PATH)
+# Identifies the model + feature list being served; cached predictions
+# from any other version are dropped
+model_version = model_digest[:12] + "-" + file_digest(FEATURE_PATH)[:12]
+
+compiled_model, compiled_source = load_compiled_model(model_digest) if COMPILED_INFERENCE else (None, None)
+if compiled_model is not None:
+    print("Compiled Forest:", compiled_model.n_estimators, "trees,",
+          len(compiled_model.feature), "nodes", "(%s)" % compiled_source)
+else:
+    load_sklearn_model()
+
+
+def load_transformer():
+    """
+    Load the transformer fitted by train.py; older model folders only have
+    feature_columns.pkl, so fall back to building one from the column list
+    """
+    if os.path.exists(TRANSFORMER_PATH):
+        fitted = joblib.load(TRANSFORMER_PATH)
+        if fitted.columns_ == list(feature_columns):
+            return fitted
+        print("feature_transformer.pkl does not match feature_columns.pkl, rebuilding")
+    return FeatureTransformer.from_columns(feature_columns)
+
+
+transformer = load_transformer()
+
+
+def load_explainer():
+    """
+    Tree arrays behind /explain: the compiled forest when it is serving,
+    otherwise one compiled from the pickle. The per-node delta table for
+    the success class is built here, once, so requests only walk the trees.
+    """
+    forest = compiled_model
+    if forest is None:
+        sklearn_model = load_sklearn_model()
+        if not hasattr(sklearn_model, "estimators_"):
+            return None, None
+        forest = CompiledForest.from_estimator(sklearn_model)
+
+    classes = list(forest.classes_)
+    positive = classes.index(1) if 1 in classes else len(classes) - 1
+    forest.node_deltas(positive)
+    return forest, positive
+
+
+explainer, positive_class = load_explainer()
+
+prediction_cache = PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL)
+prediction_cache.bind(model_version)
+
+
+def load_drift_monitor():
+    if not os.path.exists(DRIFT_REFERENCE_PATH):
+        print("No drift reference found, drift monitoring is off (run train.py)")
+        return None
+
+    monitor = DriftMonitor.load(DRIFT_REFERENCE_PATH)
+    if monitor.names != transformer.columns_:
+        print("drift_reference.json does not match feature_columns.pkl, drift monitoring is off")
+        return None
+    return monitor
+
+
+drift_monitor = load_drift_monitor()
+
+load_seconds = time.perf_counter() - _load_start
+
+
+def activate():
+    """
+    Point the serving metrics at this copy of the module. Called by the
+    model loader once the model has passed its warm-up, so a reload that
+    fails validation never shows up in /metrics.
+    """
+    MODEL_LOAD_SECONDS.set(load_seconds)
+    MODEL_INFO.clear()
+    MODEL_INFO.set(1, version=model_version,
+                   engine="compiled" if compiled_model is not None else "sklearn")
+
+    # Scraped straight from the cache's own counters
+    for name, metric in PREDICTION_CACHE_METRICS.items():
+        metric.set_function(lambda key=name: prediction_cache.stats()[key])
+
+
+def prepare_batch(records):
+    """
+    Convert a list of frontend inputs into one N x 26 float32 feature matrix
+    """
+    return transformer.transform(records)
+
+
 def prepare_input(user_input: dict):
     """
     Convert frontend input into full 26 feature vector
     (VERY IMPORTANT to avoid feature mismatch error)
     """
-    # Create empty feature array with same columns as training
-    input_df = {col: 0 for col in feature_columns}
+    return prepare_batch([user_input])
+
+
+def predict_matrix(matrix):
+    """
+    Run the forest once and derive labels from the probabilities
+    """
+    scorer = compiled_model if compiled_model is not None else load_sklearn_model()
+    probabilities = scorer.predict_proba(matrix)
+    predictions = scorer.classes_[probabilities.argmax(axis=1)]
+    return predictions, probabilities[:, 1]
+
+
+def cache_keys(matrix):
+    """
+    Canonical bytes of each float32 row (adding 0.0 folds -0.0 into 0.0)
+    """
+    canonical = np.ascontiguousarray(matrix, dtype=np.float32) + np.float32(0.0)
+    return [row.tobytes() for row in canonical]
+
+
+def predict_cached(matrix):
+    """
+    predict_matrix for request traffic: rows seen recently come from the
+    prediction cache and only the misses go through the model, in one call
+    """
+    BATCHES.inc()
+    BATCH_ROWS.observe(len(matrix))
+    if drift_monitor is not None:
+        drift_monitor.observe(matrix)
 
-    # Map frontend fields to model features (edit if needed)
-    if "founded_year" in user_input:
-        input_df["founded_year"] = float(user_input["founded_year"])
+    if not prediction_cache.enabled:
+        with timed("inference"):
+            predictions, probabilities = predict_matrix(matrix)
+        return predictions.astype(int).tolist(), probabilities.astype(float).tolist()
 
-    if "funding_total_usd" in user_input:
-        input_df["funding_total_usd"] = float(user_input["funding_total_usd"])
+    keys = cache_keys(matrix)
+    results = prediction_cache.get_many(keys)
+    missing = [i for i, result in enumerate(results) if result is None]
 
-    if "has_vc" in user_input:
-        input_df["has_VC"] = 1 if user_input["has_vc"] == "Yes" else 0
+    if missing:
+        with timed("inference"):
+            predictions, probabilities = predict_matrix(matrix[missing])
+        scored = list(zip(predictions.astype(int).tolist(), probabilities.astype(float).tolist()))
+        prediction_cache.put_many([keys[i] for i in missing], scored)
+        for i, result in zip(missing, scored):
+            results[i] = result
+
+    predictions, probabilities = zip(*results)
+    return list(predictions), list(probabilities)
+
+
+def predict_columnar(matrix):
+    """
+    Score a matrix decoded from a columnar request body with one model call,
+    NumPy in and out. Skips the prediction cache, whose keys are built per row.
+    """
+    BATCHES.inc()
+    BATCH_ROWS.observe(len(matrix))
+    if drift_monitor is not None:
+        drift_monitor.observe(matrix)
+
+    with timed("inference"):
+        return predict_matrix(matrix)
+
+
+def predict_batch(records):
+    """
+    Predict startup success for a list of inputs with a single model call
+    """
+    if not records:
+        return [], []
+
+    with timed("features"):
+        matrix = prepare_batch(records)
+    return predict_cached(matrix)
+
+
+def explain_batch(records, top_k=5):
+    """
+    Break each record's success probability into base value + per-feature
+    contributions and return the top_k features by absolute contribution
+    """
+    if explainer is None:
+        raise ValueError("Explanations need a tree ensemble model")
+    if not 1 <= top_k <= len(transformer.columns_):
+        raise ValueError("top_k must be between 1 and %d" % len(transformer.columns_))
 
-    if "has_angel" in user_input:
-        input_df["has_angel"] = 1 if user_input["has_angel"] == "Yes" else 0
+    with timed("features"):
+        matrix = prepare_batch(records)
+    with timed("explain"):
+        bias, contributions = explainer.explain(matrix, positive_class)
 
-    # Convert to numpy array in correct column order
-    final_input = np.array([list(input_df.values())])
-    return final_input
+    top = np.argsort(-np.abs(contributions), axis=1)[:, :top_k]
+    explanations = []
+    for i, features in enumerate(top):
+        total = contributions[i].sum()
+        explanations.append({
+            "probability": float(bias + total),
+            "base_value": bias,
+            "contributions": [
+                {
+                    "feature": transformer.columns_[j],
+                    "value": float(matrix[i, j]),
+                    "contribution": float(contributions[i, j]),
+                }
+                for j in features
+            ],
+            "other_features": float(total - contributions[i, features].sum()),
+        })
+    return explanations
+
+
+# Upper bounds for /predict/sweep so one request stays one cheap model call
+MAX_SWEEP_FIELDS = 2
+MAX_SWEEP_POINTS = 10_000
+
+
+def sweep_length(spec):
+    """
+    Number of values a sweep axis asks for, read before anything is allocated
+    """
+    if isinstance(spec, dict):
+        return int(spec.get("num", 20))
+    return len(spec)
+
+
+def sweep_values(spec):
+    """
+    A sweep axis is either an explicit list of values or
+    {"start": a, "stop": b, "num": n} (evenly spaced, inclusive)
+    """
+    if isinstance(spec, dict):
+        return np.linspace(float(spec["start"]), float(spec["stop"]), int(spec.get("num", 20)))
+    return np.array([float(v) for v in spec])
+
+
+def predict_sweep(base, sweep):
+    """
+    Probability of success as one or two fields of `base` vary. Builds the
+    whole grid as one matrix (base row tiled, swept columns overwritten)
+    and scores it with a single model call.
+    """
+    fields = list(sweep)
+    if not 1 <= len(fields) <= MAX_SWEEP_FIELDS:
+        raise ValueError("Sweep one or two fields, got %d" % len(fields))
+
+    unknown = [f for f in fields if f not in transformer.field_index_]
+    if unknown:
+        raise ValueError("Unknown sweep fields: %s" % ", ".join(unknown))
+
+    # Check the sizes first: a huge "num" would otherwise be allocated by
+    # np.linspace before the grid size is known
+    shape = tuple(sweep_length(sweep[f]) for f in fields)
+    n_points = 1
+    for n in shape:
+        if not 0 < n <= MAX_SWEEP_POINTS:
+            raise ValueError("Each sweep axis must have between 1 and %d values, got %d" % (MAX_SWEEP_POINTS, n))
+        n_points *= n
+    if n_points > MAX_SWEEP_POINTS:
+        raise ValueError("Sweep must have between 1 and %d points, got %d" % (MAX_SWEEP_POINTS, n_points))
+
+    axes = [sweep_values(sweep[f]) for f in fields]
+
+    matrix = np.repeat(prepare_input(base), n_points, axis=0)
+    for field, grid in zip(fields, np.meshgrid(*axes, indexing="ij")):
+        matrix[:, transformer.field_index_[field]] = grid.ravel()
+    transformer.derive(matrix, set(base) | set(fields))
+
+    _, probabilities = predict_matrix(matrix)
+
+    return {
+        "fields": fields,
+        "values": [a.tolist() for a in axes],
+        "probabilities": probabilities.reshape(shape).tolist(),
+    }
+
+
+def drift_report():
+    if drift_monitor is None:
+        raise ValueError("Drift monitoring is off: models/drift_reference.json is missing or stale")
+    return drift_monitor.report()
+
+
+def parse_records(body, content_type=""):
+    """
+    Parse a batch request body: a JSON array or NDJSON (one record per line)
+    """
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        records = [json.loads(line) for line in body.splitlines() if line.strip()]
+    else:
+        records = json.loads(body)
+
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        raise ValueError("Batch body must be a JSON array (or NDJSON) of objects")
+
+    return records
 
 
 def predict_startup(user_input):
     """
     Predict startup success probability
     """
-    processed_input = prepare_input(user_input)
-
-    prediction = model.predict(processed_input)[0]
-    probability = model.predict_proba(processed_input)[0][1]
+    with timed("features"):
+        matrix = prepare_input(user_input)
+    predictions, probabilities = predict_cached(matrix)
 
-    return int(prediction), float(probability)
\ No newline at end of file
+    return predictions[0], probabilities[0]
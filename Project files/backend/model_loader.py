@@ -0,0 +1,261 @@
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+from metrics import MODEL_RELOADS, TIME_TO_READY_SECONDS
+
+__all__ = ["ModelLoader", "ModelNotReady"]
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Held-out rows every new model is warmed up and checked on before it serves
+SPLIT_PATH = os.path.join(BASE_DIR, "data", "split")
+WARMUP_ROWS = 256
+
+# Scored once after loading so the first real request does not pay for
+# first-touch page faults in the node arrays and the transformer (and used
+# alone when the split files are not deployed)
+WARMUP_RECORD = {"founded_year": 2010, "funding_total_usd": 1_000_000}
+
+
+def process_age():
+    """
+    Seconds since this process started, from /proc (Linux); None elsewhere
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 (starttime, in clock ticks since boot); the fields
+            # after the ")" that closes the command name start at field 3
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ModelNotReady(Exception):
+    """Raised when a route needs the model before the background load finished."""
+
+
+def warmup_rows():
+    """
+    First WARMUP_ROWS rows of X_test, or None when the split is not there
+    """
+    if os.path.join(BASE_DIR, "src") not in sys.path:
+        sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+    from split_io import iter_split
+
+    try:
+        return next(iter_split(SPLIT_PATH, "X_test", WARMUP_ROWS))
+    except (FileNotFoundError, StopIteration):
+        return None
+
+
+class ModelLoader:
+    """
+    Imports ml_model (NumPy, joblib and the model artifacts) off the import
+    path of the web app, in a background thread, so health checks answer
+    while it loads. `module` gives the loaded ml_model or raises
+    ModelNotReady.
+
+    It is also the model registry: reload() executes ml_model again into a
+    fresh module (its own model, transformer, prediction cache and drift
+    monitor), checks it on held-out rows and swaps it in with a single
+    assignment. Requests hold on to the module they started with, so
+    in-flight calls finish on the old model. watch() reloads whenever the
+    model files change on disk.
+    """
+
+    def __init__(self, module_name="ml_model"):
+        self.module_name = module_name
+        self.created = time.perf_counter()
+        self.error = None
+        self.load_seconds = None
+        self.time_to_ready = None
+        self.reloads = 0
+        self.last_reload = None
+
+        self._module = None
+        self._ready = threading.Event()
+        self._thread = None
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        # Model files as last loaded, and as last rejected
+        self._signature = None
+        self._failed_signature = None
+
+    def start(self, background=True):
+        if self._thread is None and not self._ready.is_set():
+            if background:
+                self._thread = threading.Thread(target=self._load, name="model-loader", daemon=True)
+                self._thread.start()
+            else:
+                self._load()
+        return self
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            module = importlib.import_module(self.module_name)
+            self.validate(module)
+        except Exception as e:
+            self.error = "%s: %s" % (type(e).__name__, e)
+            print("❌ Model load failed:", self.error)
+            return
+
+        module.activate()
+        self._module = module
+        self._signature = self.file_signature()
+        self.load_seconds = time.perf_counter() - start
+        # From process start where the OS tells us, else from the loader's creation
+        age = process_age()
+        self.time_to_ready = age if age is not None else time.perf_counter() - self.created
+        TIME_TO_READY_SECONDS.set(self.time_to_ready)
+        self._ready.set()
+        print("✅ Model ready: loaded in %.2fs, %.2fs after process start" % (self.load_seconds, self.time_to_ready))
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    @property
+    def module(self):
+        if not self._ready.is_set():
+            raise ModelNotReady(self.error or "Model is still loading")
+        return self._module
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    @staticmethod
+    def validate(module):
+        """
+        Warm a freshly loaded model up on held-out rows and check that it
+        returns one probability in [0, 1] per row. Goes straight to the
+        model: no cache entries, drift counts or metrics.
+        """
+        # Imported here so importing the web apps stays free of NumPy
+        import numpy as np
+
+        rows = warmup_rows()
+        matrix = module.prepare_input(WARMUP_RECORD)
+        if rows is not None:
+            matrix = np.vstack([matrix, module.transformer.transform(rows)])
+
+        _, probabilities = module.predict_matrix(matrix)
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        if probabilities.shape != (len(matrix),):
+            raise ValueError("Model returned %s probabilities for %d rows" % (probabilities.shape, len(matrix)))
+        if not (np.isfinite(probabilities).all() and (probabilities >= 0).all() and (probabilities <= 1).all()):
+            raise ValueError("Model returned probabilities outside [0, 1]")
+
+    def _fresh_module(self):
+        """
+        Execute ml_model's source into a new module object, leaving the one
+        being served untouched
+        """
+        spec = importlib.util.find_spec(self.module_name)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def reload(self, force=False):
+        """
+        Load the model files again and swap them in if they pass validate().
+        Unless `force` is set, files with the version already being served
+        are not reloaded. The old model keeps serving on failure.
+        """
+        current = self.module
+        with self._reload_lock:
+            start = time.perf_counter()
+            signature = self.file_signature()
+            result = {"previous_version": current.model_version}
+            try:
+                if not force and signature == self._signature:
+                    result.update(status="unchanged", model_version=current.model_version)
+                else:
+                    module = self._fresh_module()
+                    if not force and module.model_version == current.model_version:
+                        result.update(status="unchanged", model_version=current.model_version)
+                    else:
+                        self.validate(module)
+                        module.activate()
+                        # The swap: requests that already hold the old module
+                        # finish on it, new requests get this one
+                        self._module = module
+                        sys.modules[self.module_name] = module
+                        self.reloads += 1
+                        result.update(status="reloaded", model_version=module.model_version)
+                    self._signature = signature
+            except Exception as e:
+                self._failed_signature = signature
+                result.update(status="failed", model_version=current.model_version,
+                              error="%s: %s" % (type(e).__name__, e))
+
+            result["seconds"] = time.perf_counter() - start
+            self.last_reload = result
+            MODEL_RELOADS.inc(result=result["status"])
+
+        if result["status"] == "failed":
+            print("❌ Model reload failed, still serving %s: %s" % (result["model_version"], result["error"]))
+        elif result["status"] == "reloaded":
+            print("🔄 Model reloaded: %s -> %s in %.2fs" % (
+                result["previous_version"], result["model_version"], result["seconds"]))
+        return result
+
+    def file_signature(self):
+        """
+        (size, mtime) of the files a model version is built from
+        """
+        module = self._module
+        signature = []
+        for path in [module.MODEL_PATH, module.FEATURE_PATH, module.TRANSFORMER_PATH]:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def watch(self, interval):
+        """
+        Poll the model files every `interval` seconds and reload once a
+        change has stayed the same for a whole interval (so a file that is
+        still being written is not picked up half way). Files that failed
+        validation are not retried until they change again.
+        """
+        if self._watcher is not None or interval <= 0:
+            return self
+
+        def run():
+            self._ready.wait()
+            pending = None
+            while True:
+                time.sleep(interval)
+                signature = self.file_signature()
+                if signature in (self._signature, self._failed_signature):
+                    pending = None
+                elif signature != pending:
+                    pending = signature
+                else:
+                    self.reload()
+                    pending = None
+
+        self._watcher = threading.Thread(target=run, name="model-watcher", daemon=True)
+        self._watcher.start()
+        return self
+
+    def status(self):
+        return {
+            "ready": self.ready,
+            "error": self.error,
+            "load_seconds": self.load_seconds,
+            "time_to_ready_s": self.time_to_ready,
+            "model_version": self._module.model_version if self.ready else None,
+            "reloads": self.reloads,
+            "last_reload": self.last_reload,
+        }
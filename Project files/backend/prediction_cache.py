@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+
+__all__ = ["PredictionCache"]
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of (prediction, probability) keyed on the canonical
+    float32 feature vector bytes. Entries expire after `ttl` seconds, and
+    the whole cache is dropped whenever it is bound to a different model
+    version, so a new model or feature list never serves stale results.
+    """
+
+    def __init__(self, maxsize=10000, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = None
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def bind(self, version):
+        """
+        Tie the cache to a model version, clearing it if the version changed
+        """
+        with self._lock:
+            if version != self.version:
+                if self.version is not None:
+                    self.invalidations += 1
+                self._entries.clear()
+                self.version = version
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        values = []
+
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] < now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+
+                if entry is None:
+                    self.misses += 1
+                    values.append(None)
+                else:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    values.append(entry[1])
+
+        return values
+
+    def put_many(self, keys, values):
+        expires = time.monotonic() + self.ttl
+
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._entries[key] = (expires, value)
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "model_version": self.version,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
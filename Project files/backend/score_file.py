@@ -0,0 +1,96 @@
+import argparse
+import os
+import time
+from multiprocessing import Pool
+
+import pandas as pd
+
+DEFAULT_CHUNKSIZE = 50_000
+
+# Set per worker process by init_worker
+ml_model = None
+
+
+def iter_chunks(path, chunksize):
+    """
+    Stream a CSV or Parquet file as DataFrames of at most chunksize rows
+    """
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Scoring Parquet files needs pyarrow (pip install pyarrow)")
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def init_worker():
+    """
+    Load the model once per worker process, not once per chunk
+    """
+    global ml_model
+    import ml_model as loaded
+    ml_model = loaded
+
+
+def score_chunk(chunk, keep=()):
+    matrix = ml_model.transformer.transform(chunk)
+    predictions, probabilities = ml_model.predict_matrix(matrix)
+
+    scored = chunk[list(keep)].copy() if keep else pd.DataFrame(index=chunk.index)
+    scored["prediction"] = predictions.astype(int)
+    scored["probability"] = probabilities
+    return scored
+
+
+def _score_job(job):
+    chunk, keep = job
+    return score_chunk(chunk, keep)
+
+
+def score_file(input_path, output_path, workers=1, chunksize=DEFAULT_CHUNKSIZE, keep=()):
+    """
+    Score every row of input_path and write prediction/probability columns
+    (plus any `keep` columns) to output_path. Chunks are scored in a process
+    pool and written in input order as soon as each one is ready.
+    """
+    jobs = ((chunk, keep) for chunk in iter_chunks(input_path, chunksize))
+    start = time.perf_counter()
+    rows = 0
+
+    if workers > 1:
+        pool = Pool(workers, initializer=init_worker)
+        results = pool.imap(_score_job, jobs)
+    else:
+        pool = None
+        init_worker()
+        results = map(_score_job, jobs)
+
+    try:
+        for i, scored in enumerate(results):
+            scored.to_csv(output_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+            rows += len(scored)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    seconds = time.perf_counter() - start
+    print("Scored %d rows in %.2fs (%.0f rows/s) -> %s" % (rows, seconds, rows / seconds, output_path))
+    return rows, seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet file of startups")
+    parser.add_argument("input", help="CSV or .parquet file with feature (or request field) columns")
+    parser.add_argument("output", help="CSV file to write predictions to")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--keep", nargs="*", default=[],
+                        help="input columns to copy to the output (e.g. an id column)")
+    args = parser.parse_args()
+
+    score_file(args.input, args.output, args.workers, args.chunksize, tuple(args.keep))
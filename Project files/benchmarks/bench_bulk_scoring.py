@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "..", "backend"))
+
+from score_file import score_file
+
+SPLIT_PATH = os.path.join(BASE_DIR, "..", "data", "split")
+
+
+def write_input(path, n_rows):
+    """
+    Tile the real test split up to n_rows
+    """
+    X_test = pd.read_csv(os.path.join(SPLIT_PATH, "X_test.csv"))
+    repeats = -(-n_rows // len(X_test))
+    pd.concat([X_test] * repeats, ignore_index=True).iloc[:n_rows].to_csv(path, index=False)
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "input.csv")
+        output_path = os.path.join(tmp, "scored.csv")
+        write_input(input_path, n_rows)
+
+        for workers in [1, 2, 4]:
+            for chunksize in [5_000, 20_000, 50_000]:
+                rows, seconds = score_file(input_path, output_path, workers, chunksize)
+                results.append({
+                    "workers": workers,
+                    "chunksize": chunksize,
+                    "rows/s": round(rows / seconds),
+                })
+
+    print("\nThroughput on", n_rows, "rows (%d CPUs):" % (os.cpu_count() or 1))
+    print(pd.DataFrame(results).pivot(index="chunksize", columns="workers", values="rows/s"))
@@ -0,0 +1,134 @@
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_PATH = os.path.join(BASE_DIR, "..", "backend")
+
+MODES = {
+    "deferred (default)": {"EAGER_MODEL_LOAD": "0"},
+    "eager": {"EAGER_MODEL_LOAD": "1"},
+}
+
+POLL_INTERVAL = 0.01
+TIMEOUT = 60
+
+
+# ---------------------------------
+# Import Time Breakdown
+# ---------------------------------
+# The background load would interleave its imports with the web app's in
+# the -X importtime output; it is timed by time_to_ready instead
+IMPORT_CODE = """
+import model_loader
+if model_loader.os.environ.get("EAGER_MODEL_LOAD") != "1":
+    model_loader.ModelLoader.start = lambda self, background=True: self
+import %s
+"""
+
+
+def import_times(module, env_overrides):
+    """
+    Per-module import cost (ms, self and cumulative) of importing `module`,
+    parsed from `python -X importtime`, with the nesting depth of each line
+    """
+    env = dict(os.environ, PYTHONWARNINGS="ignore", **env_overrides)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_CODE % module],
+        cwd=BACKEND_PATH, env=env, capture_output=True, text=True,
+    )
+
+    rows = []
+    for line in process.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", nested
+        # imports indented by two spaces per level
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({"module": name.strip(), "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                     "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    return pd.DataFrame(rows)
+
+
+def breakdown(times, module):
+    """
+    Total cost of `module` and its direct imports, by cost. Children are
+    printed before their parent, so they are the depth-1 lines between the
+    previous top-level import and the module's own line.
+    """
+    end = times.index[(times["module"] == module) & (times["depth"] == 0)][-1]
+    top_levels = times.index[(times["depth"] == 0) & (times.index < end)]
+    start = top_levels[-1] + 1 if len(top_levels) else 0
+
+    children = times.loc[start:end - 1]
+    children = children[children["depth"] == 1]
+    return times.loc[end, "cumulative_ms"], children.sort_values("cumulative_ms", ascending=False)
+
+
+# ---------------------------------
+# Time To Health / Ready
+# ---------------------------------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url, start, expect=200):
+    while time.perf_counter() - start < TIMEOUT:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == expect:
+                    return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(POLL_INTERVAL)
+    return None
+
+
+def time_to_ready(env_overrides):
+    """
+    Launch the FastAPI app under uvicorn and time the first 200 from
+    /health and from /ready, measured from process launch
+    """
+    port = free_port()
+    env = dict(os.environ, PYTHONWARNINGS="ignore", **env_overrides)
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_PATH, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        health = wait_for("http://127.0.0.1:%d/health" % port, start)
+        ready = wait_for("http://127.0.0.1:%d/ready" % port, start)
+    finally:
+        server.terminate()
+        server.wait()
+    return {"health_s": health, "ready_s": ready}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold start of the serving backends, deferred vs eager model load")
+    parser.add_argument("--repeat", type=int, default=5, help="server launches per mode")
+    parser.add_argument("--top", type=int, default=10, help="modules to show in the import breakdown")
+    args = parser.parse_args()
+
+    for module in ["main", "app"]:
+        for mode, env in MODES.items():
+            total, children = breakdown(import_times(module, env), module)
+            print("\nimport %s, %s: %.1f ms, top direct imports:" % (module, mode, total))
+            print(children.head(args.top)[["module", "self_ms", "cumulative_ms"]].to_string(index=False))
+
+    results = {
+        mode: pd.DataFrame([time_to_ready(env) for _ in range(args.repeat)]).median()
+        for mode, env in MODES.items()
+    }
+    print("\nSeconds from launch to first 200 (median of %d uvicorn launches):" % args.repeat)
+    print(pd.DataFrame(results).T.round(3))
@@ -0,0 +1,102 @@
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "..", "backend"))
+SPLIT_PATH = os.path.join(BASE_DIR, "..", "data", "split")
+
+# Synthetic-looking rows repeat; the cache would flatter the JSON route
+os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+os.environ.setdefault("MODEL_WATCH_INTERVAL", "0")
+
+from fastapi.testclient import TestClient
+import main
+from columnar import RAW_CONTENT_TYPE, ARROW_CONTENT_TYPE, COLUMNS_HEADER
+from metrics import STAGE_SECONDS
+
+# The fields the JSON route (StartupData) accepts
+JSON_FIELDS = [
+    "founded_year", "funding_total_usd", "age_first_funding_year", "age_last_funding_year",
+    "has_VC", "has_angel", "has_roundA", "has_roundB", "has_roundC", "has_roundD",
+]
+
+
+def stage_totals():
+    """
+    Seconds spent so far in each serving stage (validation, features, inference)
+    """
+    return {key[0]: state[1] for key, state in STAGE_SECONDS._values.items()}
+
+
+def tiled_test_split(n_rows):
+    X_test = pd.read_csv(os.path.join(SPLIT_PATH, "X_test.csv"))
+    repeats = -(-n_rows // len(X_test))
+    return pd.concat([X_test] * repeats, ignore_index=True).iloc[:n_rows]
+
+
+def request_bodies(frame):
+    """
+    The same rows as a JSON array, a raw float32 matrix and (with pyarrow)
+    an Arrow stream: (name, body, headers)
+    """
+    records = frame[JSON_FIELDS].astype({f: bool for f in JSON_FIELDS if f.startswith("has_")})
+    bodies = [
+        ("json", records.to_json(orient="records").encode(), {"Content-Type": "application/json"}),
+        ("raw float32", frame.to_numpy(np.float32).tobytes(),
+         {"Content-Type": RAW_CONTENT_TYPE, COLUMNS_HEADER: ",".join(frame.columns)}),
+    ]
+    try:
+        import pyarrow as pa
+    except ImportError:
+        print("pyarrow not installed, skipping the Arrow body")
+        return bodies
+
+    table = pa.Table.from_pandas(frame.astype(np.float32), preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    bodies.append(("arrow", sink.getvalue(), {"Content-Type": ARROW_CONTENT_TYPE}))
+    return bodies
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    repeat = 5
+
+    results = []
+    with TestClient(main.app) as client:
+        main.models.wait()
+        for n_rows in sizes:
+            for name, body, headers in request_bodies(tiled_test_split(n_rows)):
+                client.post("/predict/batch", content=body, headers=headers)  # warm-up
+
+                timings = []
+                before = stage_totals()
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    response = client.post("/predict/batch", content=body, headers=headers)
+                    timings.append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        raise RuntimeError("%s body returned %d" % (name, response.status_code))
+                after = stage_totals()
+
+                # Mean time per request spent turning the body into the matrix
+                parsing = sum(after.get(stage, 0) - before.get(stage, 0) for stage in ["validation", "features"])
+                seconds = float(np.median(timings))
+                results.append({
+                    "rows": n_rows,
+                    "format": name,
+                    "request_MB": round(len(body) / 1e6, 2),
+                    "parse_ms": round(parsing / repeat * 1e3, 1),
+                    "inference_ms": round((after["inference"] - before.get("inference", 0)) / repeat * 1e3, 1),
+                    "total_ms": round(seconds * 1e3, 1),
+                    "rows/s": round(n_rows / seconds),
+                })
+
+    print("\n/predict/batch, median of %d requests:" % repeat)
+    print(pd.DataFrame(results).to_string(index=False))
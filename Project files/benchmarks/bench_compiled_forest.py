@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "..", "backend"))
+
+# The single-row timing repeats one record; cache hits would hide the model
+os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+
+import ml_model
+
+SPLIT_PATH = os.path.join(BASE_DIR, "..", "data", "split")
+
+
+def time_call(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def check_parity(X):
+    """
+    Compiled probabilities must match sklearn's exactly, not just closely
+    """
+    expected = ml_model.model.predict_proba(X)
+    actual = ml_model.compiled_model.predict_proba(X)
+
+    assert np.array_equal(expected, actual), (
+        "Compiled forest differs, max abs diff: %g" % np.abs(expected - actual).max()
+    )
+    print("✅ Parity OK on", len(X), "rows")
+
+
+def compare_latency(X, repeats=200):
+    record = dict(zip(ml_model.feature_columns, X[0]))
+    compiled = ml_model.compiled_model
+
+    results = {}
+    for mode, scorer in [("stock", None), ("compiled", compiled)]:
+        ml_model.compiled_model = scorer
+        results[mode] = {
+            "predict_startup (1 row) ms": time_call(lambda: ml_model.predict_startup(record), repeats),
+            "predict_matrix (%d rows) ms" % len(X): time_call(lambda: ml_model.predict_matrix(X), 5),
+        }
+    ml_model.compiled_model = compiled
+
+    print(pd.DataFrame(results).round(3))
+
+
+if __name__ == "__main__":
+    X_test = pd.read_csv(os.path.join(SPLIT_PATH, "X_test.csv")).to_numpy()
+    X_train = pd.read_csv(os.path.join(SPLIT_PATH, "X_train.csv")).to_numpy()
+
+    check_parity(np.vstack([X_train, X_test]))
+    compare_latency(X_test)
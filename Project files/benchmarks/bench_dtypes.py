@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_PATH = os.path.join(BASE_DIR, "..", "src")
+RAW_PATH = os.path.join(BASE_DIR, "..", "data", "raw", "startup data.csv")
+
+# Each mode runs in a fresh process so ru_maxrss is that mode's own peak:
+# read the raw CSV, preprocess it and build the float32 training matrix
+WORKER_CODE = """
+import json, resource, sys, time
+import numpy as np
+import pandas as pd
+from preprocessing import read_raw, transform_chunk
+
+path, compact = sys.argv[1], sys.argv[2] == "compact"
+start = time.perf_counter()
+
+data = read_raw(path) if compact else pd.read_csv(path)
+read_s = time.perf_counter() - start
+
+data = transform_chunk(data, compact=compact)
+frame_mb = data.memory_usage(deep=True).sum() / 1e6
+
+X = data.drop(columns=["status"])
+X = X.drop(columns=X.select_dtypes(include=["object", "category"]).columns)
+matrix = X.to_numpy(np.float32)
+
+print(json.dumps({
+    "read_s": read_s,
+    "total_s": time.perf_counter() - start,
+    "frame_MB": frame_mb,
+    "peak_rss_MB": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def write_input(path, n_rows):
+    """
+    Tile the raw dataset's lines up to n_rows without parsing them
+    """
+    with open(RAW_PATH) as f:
+        header = f.readline()
+        lines = f.readlines()
+
+    with open(path, "w") as out:
+        out.write(header)
+        written = 0
+        while written < n_rows:
+            block = lines[:n_rows - written]
+            out.writelines(block)
+            written += len(block)
+
+
+def measure(path, mode):
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER_CODE, path, mode],
+        cwd=SRC_PATH, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "startups.csv")
+        write_input(path, n_rows)
+        print("Input: %d rows, %.0f MB" % (n_rows, os.path.getsize(path) / 1e6))
+
+        results = {mode: measure(path, mode) for mode in ["default", "compact"]}
+
+    results = pd.DataFrame(results).T
+    print(results.round(2))
+    print("\nPeak memory: %.1fx lower, end-to-end: %.1fx faster" % (
+        results.loc["default", "peak_rss_MB"] / results.loc["compact", "peak_rss_MB"],
+        results.loc["default", "total_s"] / results.loc["compact", "total_s"],
+    ))
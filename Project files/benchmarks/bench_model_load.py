@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_PATH = os.path.join(BASE_DIR, "..", "backend")
+
+# Each worker imports ml_model, scores one record, reports its memory and
+# then blocks on stdin so that all workers are alive while being measured
+WORKER_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import ml_model
+ml_model.predict_startup({"founded_year": 2005, "funding_total_usd": 1e6})
+first_prediction = time.perf_counter() - start
+
+memory = {}
+with open("/proc/self/smaps_rollup") as f:
+    for line in f:
+        key, _, rest = line.partition(":")
+        if key in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+            memory[key] = int(rest.split()[0]) / 1024
+
+print(json.dumps({"first_prediction_s": first_prediction, **memory}), flush=True)
+sys.stdin.read()
+"""
+
+MODES = {
+    "pickle (stock)": {"COMPILED_INFERENCE": "0"},
+    "compiled, private copy": {"COMPILED_INFERENCE": "1", "MODEL_MMAP": "0"},
+    "compiled, mmap bundle": {"COMPILED_INFERENCE": "1", "MODEL_MMAP": "1"},
+}
+
+
+def measure(env_overrides, n_workers):
+    env = dict(os.environ, PYTHONWARNINGS="ignore", **env_overrides)
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER_CODE],
+            cwd=BACKEND_PATH, env=env, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+        for _ in range(n_workers)
+    ]
+
+    reports = []
+    for worker in workers:
+        # ml_model prints its load messages first; the report is the JSON line
+        for line in worker.stdout:
+            if line.startswith("{"):
+                reports.append(json.loads(line))
+                break
+
+    for worker in workers:
+        worker.stdin.close()
+        worker.wait()
+
+    return pd.DataFrame(reports).mean()
+
+
+if __name__ == "__main__":
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+    # Warm the bundle so the mmap mode measures a steady-state restart
+    measure(MODES["compiled, mmap bundle"], 1)
+
+    results = {mode: measure(env, n_workers) for mode, env in MODES.items()}
+
+    print("Per-worker averages over", n_workers, "concurrent workers (memory in MB):")
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(pd.DataFrame(results).T.round(3))
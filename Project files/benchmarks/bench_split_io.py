@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "..", "src"))
+
+from split_io import save_split, load_split
+
+SPLIT_PATH = os.path.join(BASE_DIR, "..", "data", "split")
+
+
+def scaled_split(n_rows):
+    """
+    Tile the real training split up to n_rows
+    """
+    split = load_split(SPLIT_PATH, names=["X_train", "y_train"], fmt="csv")
+    repeats = -(-n_rows // len(split["X_train"]))
+    X = pd.concat([split["X_train"]] * repeats, ignore_index=True).iloc[:n_rows]
+    y = pd.Series(np.tile(split["y_train"], repeats)[:n_rows], name="status")
+    return X, y
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def compare(n_rows):
+    X, y = scaled_split(n_rows)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ["csv", "npy"]:
+            _, write_s = timed(lambda: save_split(tmp, fmt=fmt, X_train=X, y_train=y))
+            split, load_s = timed(lambda: load_split(tmp, names=["X_train", "y_train"], fmt=fmt))
+
+            # What train.py actually needs: a float32 matrix
+            _, matrix_s = timed(lambda: split["X_train"].to_numpy(dtype=np.float32))
+
+            size_mb = sum(
+                os.path.getsize(os.path.join(tmp, name + "." + fmt)) for name in ["X_train", "y_train"]
+            ) / 1e6
+            results[fmt] = {
+                "write s": write_s,
+                "load s": load_s,
+                "load + float32 matrix s": load_s + matrix_s,
+                "size MB": size_mb,
+            }
+
+    print("\nRows:", n_rows)
+    print(pd.DataFrame(results).round(3))
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]:
+        compare(n)
@@ -0,0 +1,119 @@
+import argparse
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "..", "backend"))
+
+from compiled_forest import CompiledForest
+
+MODEL_FILE = os.path.join(BASE_DIR, "..", "models", "model.pkl")
+SPLIT_PATH = os.path.join(BASE_DIR, "..", "data", "split")
+
+# Compact artifacts store node values as float32
+COMPACT_TOLERANCE = 1e-6
+
+
+# ---------------------------------
+# Check Rows
+# ---------------------------------
+def random_rows(X, n_rows, rng):
+    """
+    Rows drawn column by column from the observed values, so features
+    combine in ways the split files never show
+    """
+    return np.column_stack([rng.choice(X[:, j], n_rows) for j in range(X.shape[1])]).astype(np.float32)
+
+
+def nan_rows(X, rng, rate=0.3):
+    """
+    Copies of real rows with a share of values (and one whole row) set to NaN
+    """
+    X = X.astype(np.float32)
+    X[rng.random(X.shape) < rate] = np.nan
+    X[0] = np.nan
+    return X
+
+
+def threshold_rows(model, X, rng, n_rows=2000):
+    """
+    Real rows with one feature set exactly on a split threshold of the
+    forest, or on the float32 neighbours just below and above it
+    """
+    splits = [(f, t) for tree in model.estimators_
+              for f, t in zip(tree.tree_.feature, tree.tree_.threshold) if f >= 0]
+    picked = rng.choice(len(splits), n_rows)
+
+    rows = X[rng.choice(len(X), n_rows)].astype(np.float32)
+    for i, split in enumerate(picked):
+        feature, threshold = splits[split]
+        value = np.float32(threshold)
+        rows[i, feature] = [value, np.nextafter(value, -np.inf), np.nextafter(value, np.inf)][i % 3]
+    return rows
+
+
+# ---------------------------------
+# Parity
+# ---------------------------------
+def check(name, forest, model, X, tolerance):
+    """
+    Probabilities, labels and the explain() sum against the sklearn model.
+    Returns the failure messages.
+    """
+    expected = model.predict_proba(X)
+    actual = forest.predict_proba(X)
+    failures = []
+
+    diff = np.abs(expected - actual).max()
+    if diff > tolerance:
+        failures.append("%s: max abs proba diff %g" % (name, diff))
+    if not np.array_equal(model.predict(X), forest.predict(X)):
+        failures.append("%s: predicted labels differ" % name)
+
+    bias, contributions = forest.explain(X, class_index=1)
+    explain_diff = np.abs(bias + contributions.sum(axis=1) - actual[:, 1]).max()
+    if explain_diff > 1e-9:
+        failures.append("%s: explain sum off by %g" % (name, explain_diff))
+
+    print("%s %-28s %6d rows, max diff %.2g" % ("❌" if failures else "✅", name, len(X), diff))
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compiled forest vs sklearn parity; exits 1 on any mismatch")
+    parser.add_argument("--model", default=MODEL_FILE, help="pickled RandomForestClassifier")
+    parser.add_argument("--rows", type=int, default=5000, help="random rows to check")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    model = joblib.load(args.model)
+    X = pd.concat([
+        pd.read_csv(os.path.join(SPLIT_PATH, name)) for name in ["X_train.csv", "X_test.csv"]
+    ]).to_numpy(np.float32)
+
+    row_sets = {
+        "split rows": X,
+        "random rows": random_rows(X, args.rows, rng),
+        "NaN rows": nan_rows(X, rng),
+        "threshold rows": threshold_rows(model, X, rng),
+    }
+
+    full = CompiledForest.from_estimator(model)
+    forests = [("full", full, 0.0), ("compact", full.compact(), COMPACT_TOLERANCE)]
+
+    failures = []
+    for forest_name, forest, tolerance in forests:
+        for rows_name, rows in row_sets.items():
+            failures += check("%s / %s" % (forest_name, rows_name), forest, model, rows, tolerance)
+
+    if failures:
+        print("\n❌ Parity check failed:")
+        for failure in failures:
+            print("  ", failure)
+        sys.exit(1)
+    print("\n✅ Compiled forest matches sklearn")
@@ -0,0 +1,303 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_PATH = os.path.abspath(os.path.join(BASE_DIR, "..", "src"))
+BACKEND_PATH = os.path.abspath(os.path.join(BASE_DIR, "..", "backend"))
+
+RESULTS_PATH = os.path.join(BASE_DIR, "results", "latest.json")
+BASELINE_PATH = os.path.join(BASE_DIR, "baseline.json")
+
+SIZES = [1_000, 100_000, 10_000_000]
+
+# Pipeline stages in dependency order; each one reads what the previous wrote
+STAGES = ["synthetic_data", "preprocessing", "eda", "feature_engineering", "train",
+          "train_out_of_core", "tuning"]
+PREDICTION_PATHS = [
+    ("flask", "single"), ("flask", "batch"),
+    ("fastapi", "single"), ("fastapi", "batch"),
+]
+
+# Stages that would run for hours on one machine at the largest sizes are
+# skipped above these row counts unless --no-limits is given (train fits
+# six forests because of cross-validation, tuning dozens)
+STAGE_MAX_ROWS = {"train": 1_000_000, "tuning": 100_000}
+
+# The raw file is streamed through preprocessing above this size
+STREAM_ABOVE = 1_000_000
+STREAM_CHUNKSIZE = 200_000
+
+# Prediction paths score at most this many rows per size
+SINGLE_MAX_REQUESTS = 2_000
+BATCH_MAX_ROWS = 100_000
+BATCH_SIZE = 1_000
+
+REQUEST_FIELDS = [
+    "founded_year", "funding_total_usd", "age_first_funding_year", "age_last_funding_year",
+    "has_VC", "has_angel", "has_roundA", "has_roundB", "has_roundC", "has_roundD",
+]
+
+
+def workspace_paths(workspace):
+    return {
+        "raw": os.path.join(workspace, "raw.csv"),
+        "processed": os.path.join(workspace, "processed", ""),
+        "split": os.path.join(workspace, "split", ""),
+        "models": os.path.join(workspace, "models", ""),
+        "reports": os.path.join(workspace, "reports", ""),
+    }
+
+
+# ---------------------------------
+# Worker Side (one fresh process per task)
+# ---------------------------------
+def run_stage(stage, workspace, n_rows):
+    """
+    Run one pipeline stage against the workspace instead of data/ and
+    models/ by pointing the module's path constants there
+    """
+    sys.path.insert(0, SRC_PATH)
+    paths = workspace_paths(workspace)
+    for key in ["processed", "split", "models", "reports"]:
+        os.makedirs(paths[key], exist_ok=True)
+
+    if stage == "synthetic_data":
+        import synthetic_data
+        synthetic_data.write_synthetic(paths["raw"], n_rows)
+
+    elif stage == "preprocessing":
+        import preprocessing
+        preprocessing.DATA_PATH = paths["raw"]
+        preprocessing.PROCESSED_PATH = paths["processed"]
+        preprocessing.preprocess_data(chunksize=STREAM_CHUNKSIZE if n_rows > STREAM_ABOVE else None)
+
+    elif stage == "eda":
+        import matplotlib
+        matplotlib.use("Agg")
+        import eda
+        eda.DATA_PATH = paths["raw"]
+        eda.FIGURE_PATH = os.path.join(paths["reports"], "figures", "")
+        eda.CACHE_PATH = eda.FIGURE_PATH + ".eda_cache.json"
+        eda.CUBE_PATH = os.path.join(paths["processed"], "eda_cube.pkl")
+        os.makedirs(eda.FIGURE_PATH, exist_ok=True)
+        eda.run_eda(workers=1, force=True)
+
+    elif stage == "feature_engineering":
+        import feature_engineering
+        feature_engineering.DATA_PATH = paths["processed"] + "startup_processed.csv"
+        feature_engineering.SPLIT_PATH = paths["split"]
+        feature_engineering.feature_engineering(fmt="npy")
+
+    elif stage in ("train", "train_out_of_core"):
+        import train
+        train.SPLIT_PATH = paths["split"]
+        train.MODEL_PATH = paths["models"]
+        train.REPORT_PATH = paths["reports"]
+        train.COMPACT_PATH = paths["models"] + "model_compact.npz"
+        train.DRIFT_REFERENCE_PATH = paths["models"] + "drift_reference.json"
+        if stage == "train":
+            train.train_model()
+        else:
+            train.train_out_of_core()
+
+    elif stage == "tuning":
+        import tuning
+        tuning.SPLIT_PATH = paths["split"]
+        tuning.MODEL_PATH = paths["models"]
+        tuning.REPORT_PATH = paths["reports"] + "tuning_report.json"
+        tuning.hyperparameter_tuning(search="halving")
+
+    else:
+        raise ValueError("Unknown stage %r" % stage)
+
+    return n_rows
+
+
+def run_prediction(app_name, mode, workspace, n_rows):
+    """
+    Score synthetic records through a backend's routes with its test
+    client (no network), one request per row or BATCH_SIZE rows per request
+    """
+    sys.path.insert(0, BACKEND_PATH)
+    limit = min(n_rows, SINGLE_MAX_REQUESTS if mode == "single" else BATCH_MAX_ROWS)
+    records = pd.read_csv(
+        workspace_paths(workspace)["processed"] + "startup_processed.csv",
+        usecols=REQUEST_FIELDS, nrows=limit,
+    ).to_dict(orient="records")
+
+    if app_name == "flask":
+        import app as server
+        client = server.app.test_client()
+    else:
+        from fastapi.testclient import TestClient
+        import main as server
+        client = TestClient(server.app).__enter__()
+    server.models.wait()
+
+    def post(url, payload):
+        response = client.post(url, json=payload)
+        if response.status_code != 200:
+            raise RuntimeError("%s returned %d" % (url, response.status_code))
+
+    # Warm-up request outside the timed region
+    post("/predict", records[0])
+
+    start = time.perf_counter()
+    if mode == "single":
+        for record in records:
+            post("/predict", record)
+    else:
+        for offset in range(0, len(records), BATCH_SIZE):
+            post("/predict/batch", records[offset:offset + BATCH_SIZE])
+    return len(records), time.perf_counter() - start
+
+
+def worker(task, workspace, n_rows):
+    start = time.perf_counter()
+    if task.startswith("predict:"):
+        _, app_name, mode = task.split(":")
+        rows, seconds = run_prediction(app_name, mode, workspace, n_rows)
+    else:
+        rows = run_stage(task, workspace, n_rows)
+        seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        "rows_processed": rows,
+        "seconds": seconds,
+        "peak_rss_MB": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+# ---------------------------------
+# Driver
+# ---------------------------------
+def serving_env(workspace):
+    """
+    Point the backends at the model the train stages just wrote to the
+    workspace, so prediction timings belong to this run's model; the
+    committed models/ are used only when no train stage ran
+    """
+    models = workspace_paths(workspace)["models"]
+    if not os.path.exists(models + "startup_success_model.pkl"):
+        print("   no model trained in this run, serving the committed models/", flush=True)
+        return {}
+    return {"MODEL_DIR": models, "MODEL_FILE": "startup_success_model.pkl", "MODEL_WATCH_INTERVAL": "0"}
+
+
+def measure(task, workspace, n_rows):
+    env = dict(os.environ, PYTHONWARNINGS="ignore", MPLBACKEND="Agg",
+               # Synthetic rows repeat values; the cache would flatter the backends
+               PREDICTION_CACHE_SIZE="0")
+    if task.startswith("predict:"):
+        env.update(serving_env(workspace))
+    process = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", task, workspace, str(n_rows)],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    if process.returncode != 0:
+        return {"status": "failed", "error": process.stderr.strip().splitlines()[-1:]}
+
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result["rows_per_s"] = result["rows_processed"] / result["seconds"] if result["seconds"] else None
+    result["status"] = "ok"
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes, stages, predictions=True, limits=True):
+    results = []
+    for n_rows in sizes:
+        with tempfile.TemporaryDirectory(prefix="prosperity-bench-") as workspace:
+            tasks = list(stages)
+            if predictions:
+                tasks += ["predict:%s:%s" % path for path in PREDICTION_PATHS]
+
+            for task in tasks:
+                if limits and n_rows > STAGE_MAX_ROWS.get(task, float("inf")):
+                    result = {"status": "skipped", "error": "above STAGE_MAX_ROWS"}
+                else:
+                    print("▶  %-24s %12d rows" % (task, n_rows), flush=True)
+                    result = measure(task, workspace, n_rows)
+                results.append({"task": task, "rows": n_rows, **result})
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def summarize(report, baseline=None):
+    frame = pd.DataFrame(report["results"]).set_index(["task", "rows"])
+    columns = ["status", "seconds", "rows_per_s", "peak_rss_MB"]
+    summary = frame[[c for c in columns if c in frame.columns]]
+
+    if baseline is not None:
+        before = pd.DataFrame(baseline["results"]).set_index(["task", "rows"])
+        summary = summary.join(before[["seconds", "peak_rss_MB"]], rsuffix="_baseline")
+        summary["time_ratio"] = summary["seconds"] / summary["seconds_baseline"]
+        summary["rss_ratio"] = summary["peak_rss_MB"] / summary["peak_rss_MB_baseline"]
+
+    with pd.option_context("display.width", 160, "display.max_columns", 20):
+        print(summary.round(3))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        worker(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages and prediction paths on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES,
+                        help="pipeline stages to run (synthetic_data and the stages before the "
+                             "ones you pick are needed for their inputs)")
+    parser.add_argument("--no-predictions", action="store_true", help="skip the backend benchmarks")
+    parser.add_argument("--no-limits", action="store_true", help="ignore STAGE_MAX_ROWS")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="earlier results to compare against (skipped if missing)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="also write these results as the new baseline")
+    args = parser.parse_args()
+
+    report = run_suite(args.sizes, args.stages, predictions=not args.no_predictions,
+                       limits=not args.no_limits)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print("\nResults saved:", args.output)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    summarize(report, baseline)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print("Baseline updated:", args.baseline)
@@ -6,8 +6,9 @@ import pandas as pd
 # Dataset reference from Kaggle
 DATASET_NAME = "manishkc06/startup-success-prediction"
 
-# Define storage path
-RAW_DATA_DIR = "../data/raw"
+# Define storage path (relative to this file, not the working directory)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RAW_DATA_DIR = os.path.join(BASE_DIR, "..", "data", "raw")
 
 def download_dataset():
     print("Downloading dataset from Kaggle...")
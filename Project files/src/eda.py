@@ -1,25 +1,57 @@
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # non-interactive backend, safe in worker processes
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import json
+import time
+import hashlib
+import inspect
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
 # ------------------------------
 # Paths
 # ------------------------------
-DATA_PATH = "../data/raw/startup data.csv"
-FIGURE_PATH = "../reports/figures/"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, "..", "data", "raw", "startup data.csv")
+FIGURE_PATH = os.path.join(BASE_DIR, "..", "reports", "figures", "")
 os.makedirs(FIGURE_PATH, exist_ok=True)
 
+# Persisted summary cube every figure is drawn from
+CUBE_PATH = os.path.join(BASE_DIR, "..", "data", "processed", "eda_cube.pkl")
+
+# Fingerprint of the data slice and plotting code behind every figure
+CACHE_PATH = FIGURE_PATH + ".eda_cache.json"
+
+TOP_STATES = ['CA', 'NY', 'MA', 'TX', 'WA']
+
+FUNDING_COLS = [
+    "has_VC", "has_angel", "has_roundA",
+    "has_roundB", "has_roundC", "has_roundD"
+]
 
 # ------------------------------
-# Load & Clean Data
+# Summary Cube Layout
 # ------------------------------
-def load_data():
+CUBE_KEYS = ['State', 'category', 'founded_year', 'status']
 
-    data = pd.read_csv(DATA_PATH)
+# Funding sketch: one count per bin. Bin 0 is [0, 1e3), then 8 log-spaced
+# bins per decade up to 1e9; everything from 1e9 up lands in the last bin
+# (the outliers the funding boxplot leaves out).
+FUNDING_EDGES = np.concatenate([[0.0], np.logspace(3, 9, 49)])
+FUNDING_BINS = ["fund_bin_%02d" % i for i in range(len(FUNDING_EDGES))]
+
+# Rows per chunk when building the cube
+CHUNKSIZE = 100_000
 
-    print("Initial Dataset Shape:", data.shape)
+
+# ------------------------------
+# Load & Clean Data
+# ------------------------------
+def clean_data(data):
 
     # Drop unnecessary columns safely
     cols_to_drop = [
@@ -53,6 +85,20 @@ def load_data():
     # Create category column
     data['category'] = data['category_code']
 
+    # Reduced state column used by the state figures
+    data['State'] = data['state_code'].where(data['state_code'].isin(TOP_STATES), 'other')
+
+    return data
+
+
+def load_data():
+
+    data = pd.read_csv(DATA_PATH)
+
+    print("Initial Dataset Shape:", data.shape)
+
+    data = clean_data(data)
+
     print("Final Dataset Shape:", data.shape)
     print("Columns Available:\n", data.columns)
 
@@ -60,15 +106,161 @@ def load_data():
 
 
 # ------------------------------
-# State Analysis
+# One-Pass Aggregation
 # ------------------------------
-def state_analysis(data):
+def numeric_columns(data):
+    return data.select_dtypes(include=['int64','float64']).columns.tolist()
+
+
+def aggregate_chunk(data):
+    """
+    Reduce one cleaned chunk to (group cube, moments). Both are plain sums
+    (plus min/max), so chunks merge by adding them up.
+    """
+    funding = data['funding_total_usd']
+    fund_bin = np.searchsorted(FUNDING_EDGES, funding.fillna(-1), side='right') - 1
+
+    keyed = data[CUBE_KEYS].assign(
+        count=1,
+        funding_sum=funding.fillna(0),
+        funding_count=funding.notna().astype(int),
+        fund_bin=fund_bin,
+        **{col: data[col] for col in FUNDING_COLS}
+    )
 
-    data['State'] = data['state_code'].apply(
-        lambda x: x if x in ['CA', 'NY', 'MA', 'TX', 'WA'] else 'other'
+    sums = keyed.drop(columns='fund_bin').groupby(CUBE_KEYS, dropna=False).sum()
+    sketch = (
+        keyed[keyed['fund_bin'] >= 0]
+        .groupby(CUBE_KEYS + ['fund_bin'], dropna=False).size()
+        .unstack(fill_value=0)
+        .reindex(columns=range(len(FUNDING_EDGES)), fill_value=0)
     )
+    sketch.columns = FUNDING_BINS
+    cube = sums.join(sketch).fillna(0)
+
+    # Pairwise-complete moments, enough for describe()-style stats and the
+    # same correlations DataFrame.corr() computes
+    cols = numeric_columns(data)
+    X = data[cols].to_numpy(dtype=np.float64)
+    present = ~np.isnan(X)
+    Z = np.where(present, X, 0.0)
+    M = present.astype(np.float64)
+
+    moments = {
+        "columns": cols,
+        "n": M.T @ M,
+        "sx": Z.T @ M,
+        "sxx": (Z * Z).T @ M,
+        "sxy": Z.T @ Z,
+        "min": np.nanmin(np.where(present, X, np.inf), axis=0),
+        "max": np.nanmax(np.where(present, X, -np.inf), axis=0),
+    }
+    return cube, moments
+
+
+def align_moments(m, columns):
+    """
+    Moments of one chunk laid out over `columns`. A chunk can miss a
+    numeric column (e.g. read as text there); it contributes nothing to it.
+    """
+    if m["columns"] == columns:
+        return m
+
+    index = [columns.index(c) for c in m["columns"]]
+    aligned = {"columns": columns}
+    for key in ["n", "sx", "sxx", "sxy"]:
+        aligned[key] = np.zeros((len(columns), len(columns)))
+        aligned[key][np.ix_(index, index)] = m[key]
+    aligned["min"] = np.full(len(columns), np.inf)
+    aligned["min"][index] = m["min"]
+    aligned["max"] = np.full(len(columns), -np.inf)
+    aligned["max"][index] = m["max"]
+    return aligned
+
+
+def merge_aggregates(parts):
+    cubes, moments = zip(*parts)
+
+    cube = pd.concat(cubes).groupby(level=CUBE_KEYS, dropna=False).sum().reset_index()
+
+    # Chunks are summed position by position, so put them on one column order
+    columns = list(dict.fromkeys(c for m in moments for c in m["columns"]))
+    moments = [align_moments(m, columns) for m in moments]
+
+    merged = dict(moments[0])
+    for m in moments[1:]:
+        for key in ["n", "sx", "sxx", "sxy"]:
+            merged[key] = merged[key] + m[key]
+        merged["min"] = np.minimum(merged["min"], m["min"])
+        merged["max"] = np.maximum(merged["max"], m["max"])
+
+    return cube, merged
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cube_fingerprint(path):
+    """
+    Raw file, cube-building code and bin layout: a change to any of them
+    invalidates the persisted cube
+    """
+    digest = hashlib.sha256(file_sha256(path).encode())
+    for fn in [clean_data, numeric_columns, aggregate_chunk, align_moments, merge_aggregates]:
+        digest.update(inspect.getsource(fn).encode())
+    digest.update(json.dumps([CUBE_KEYS, FUNDING_COLS, FUNDING_BINS]).encode())
+    digest.update(FUNDING_EDGES.tobytes())
+    return digest.hexdigest()
+
+
+def build_cube(path=DATA_PATH, chunksize=CHUNKSIZE):
+    """
+    Single pass over the raw file in bounded-memory chunks, producing the
+    summary cube keyed by (State, category, founded_year, status) with
+    counts, funding sums, funding sketches and funding-round flag sums,
+    plus the moments behind the statistical summary and correlations.
+    The result is persisted and reused until the raw file or the code
+    and bins behind it change.
+    """
+    fingerprint = cube_fingerprint(path)
+    if os.path.exists(CUBE_PATH):
+        bundle = pd.read_pickle(CUBE_PATH)
+        if bundle.get("fingerprint") == fingerprint:
+            print("Reusing summary cube:", CUBE_PATH)
+            return bundle
+
+    rows = 0
+    parts = []
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        chunk = clean_data(chunk)
+        rows += len(chunk)
+        parts.append(aggregate_chunk(chunk))
+
+    cube, moments = merge_aggregates(parts)
+    bundle = {"fingerprint": fingerprint, "rows": rows, "cube": cube, "moments": moments}
+
+    os.makedirs(os.path.dirname(CUBE_PATH), exist_ok=True)
+    pd.to_pickle(bundle, CUBE_PATH)
+
+    print("Summary cube built from %d rows: %d groups" % (rows, len(cube)))
+    return bundle
+
+
+def group_counts(cube, by):
+    return cube.groupby(by)['count'].sum()
 
-    state_count = data['State'].value_counts()
+
+# ------------------------------
+# State Analysis
+# ------------------------------
+def state_analysis(cube):
+
+    state_count = group_counts(cube, 'State').sort_values(ascending=False)
 
     plt.figure(figsize=(6,6))
     plt.pie(state_count, labels=state_count.index, autopct='%1.1f%%')
@@ -80,9 +272,9 @@ def state_analysis(data):
 # ------------------------------
 # Category Analysis
 # ------------------------------
-def category_analysis(data):
+def category_analysis(cube):
 
-    category_count = data['category'].value_counts()
+    category_count = group_counts(cube, 'category').sort_values(ascending=False)
 
     plt.figure(figsize=(8,8))
     plt.pie(category_count, labels=category_count.index, autopct='%1.1f%%')
@@ -94,9 +286,9 @@ def category_analysis(data):
 # ------------------------------
 # Status Distribution
 # ------------------------------
-def status_distribution(data):
+def status_distribution(cube):
 
-    prop_df = data.groupby('status').size().reset_index(name='counts')
+    prop_df = group_counts(cube, 'status').reset_index(name='counts')
     prop_df['proportions'] = prop_df['counts'] / prop_df['counts'].sum()
 
     plt.figure(figsize=(6,4))
@@ -109,9 +301,9 @@ def status_distribution(data):
 # ------------------------------
 # State vs Status
 # ------------------------------
-def state_vs_status(data):
+def state_vs_status(cube):
 
-    prop_df = data.groupby(['State','status']).size().reset_index(name='counts')
+    prop_df = group_counts(cube, ['State','status']).reset_index(name='counts')
     prop_df['proportions'] = prop_df.groupby('State')['counts'].transform(lambda x: x/x.sum())
 
     plt.figure(figsize=(8,6))
@@ -124,9 +316,9 @@ def state_vs_status(data):
 # ------------------------------
 # Category vs Status
 # ------------------------------
-def category_vs_status(data):
+def category_vs_status(cube):
 
-    prop_df = data.groupby(['category','status']).size().reset_index(name='counts')
+    prop_df = group_counts(cube, ['category','status']).reset_index(name='counts')
     prop_df['proportions'] = prop_df.groupby('category')['counts'].transform(lambda x: x/x.sum())
 
     plt.figure(figsize=(14,6))
@@ -140,19 +332,9 @@ def category_vs_status(data):
 # ------------------------------
 # Category vs Founded Year
 # ------------------------------
-def category_vs_year(data):
+def category_vs_year(cube):
 
-    # Ensure founded_year exists
-    if 'founded_year' not in data.columns:
-        data['founded_at'] = pd.to_datetime(data['founded_at'], errors='coerce')
-        data['founded_year'] = data['founded_at'].dt.year
-
-    data = data.dropna(subset=['founded_year'])
-
-    cat_year = pd.crosstab(
-        index=data['founded_year'],
-        columns=data['category']
-    )
+    cat_year = group_counts(cube, ['founded_year', 'category']).unstack(fill_value=0)
 
     plt.figure(figsize=(14,6))
     sns.lineplot(data=cat_year)
@@ -164,19 +346,46 @@ def category_vs_year(data):
 # ------------------------------
 # Founded Year vs Funding
 # ------------------------------
-def year_vs_funding(data):
-
-    if 'founded_year' not in data.columns:
-        data['founded_at'] = pd.to_datetime(data['founded_at'], errors='coerce')
-        data['founded_year'] = data['founded_at'].dt.year
-
-    data = data.dropna(subset=['founded_year'])
-
-    # Remove extreme outliers for readability
-    data = data[data['funding_total_usd'] < 1e9]
-
-    plt.figure(figsize=(14,6))
-    sns.boxplot(data=data, x="founded_year", y="funding_total_usd")
+def sketch_quantile(counts, q):
+    """
+    Approximate quantile from binned counts, interpolating log-linearly
+    inside the bin (linearly in the first [0, 1e3) bin)
+    """
+    cumulative = np.cumsum(counts)
+    target = q * cumulative[-1]
+    i = min(int(np.searchsorted(cumulative, target)), len(counts) - 1)
+    before = cumulative[i - 1] if i > 0 else 0
+    fraction = (target - before) / counts[i] if counts[i] else 0.0
+
+    low, high = FUNDING_EDGES[i], FUNDING_EDGES[i + 1]
+    if low == 0:
+        return low + fraction * (high - low)
+    return low * (high / low) ** fraction
+
+
+def year_vs_funding(cube):
+
+    # The last bin holds funding >= 1e9: removed as extreme outliers for readability
+    sketch = cube.groupby('founded_year')[FUNDING_BINS[:-1]].sum()
+    sketch = sketch[sketch.sum(axis=1) > 0]
+
+    stats = []
+    for year, counts in sketch.iterrows():
+        counts = counts.to_numpy()
+        q1, med, q3 = (sketch_quantile(counts, q) for q in (0.25, 0.5, 0.75))
+        nonzero = np.flatnonzero(counts)
+        lowest, highest = FUNDING_EDGES[nonzero[0]], FUNDING_EDGES[nonzero[-1] + 1]
+        iqr = q3 - q1
+        stats.append({
+            "label": str(year), "q1": q1, "med": med, "q3": q3,
+            "whislo": max(lowest, q1 - 1.5 * iqr),
+            "whishi": min(highest, q3 + 1.5 * iqr),
+        })
+
+    fig, ax = plt.subplots(figsize=(14,6))
+    ax.bxp(stats, showfliers=False)
+    ax.set_xlabel("founded_year")
+    ax.set_ylabel("funding_total_usd")
     plt.xticks(rotation=90)
     plt.title("Founded Year vs Total Funding")
     plt.savefig(FIGURE_PATH + "year_vs_funding.png")
@@ -186,19 +395,19 @@ def year_vs_funding(data):
 # ------------------------------
 # Funding Round Analysis
 # ------------------------------
-def funding_round_analysis(data):
-
-    funding_cols = [
-        "has_VC", "has_angel", "has_roundA",
-        "has_roundB", "has_roundC", "has_roundD"
-    ]
+def funding_round_analysis(cube):
 
-    d = data[data['status'] == 1]
+    d = cube[cube['status'] == 1]
 
-    melted = pd.melt(d[funding_cols])
+    total = d['count'].sum()
+    ones = d[FUNDING_COLS].sum()
+    melted = pd.concat([
+        pd.DataFrame({'variable': FUNDING_COLS, 'value': 0, 'count': (total - ones).to_numpy()}),
+        pd.DataFrame({'variable': FUNDING_COLS, 'value': 1, 'count': ones.to_numpy()}),
+    ])
 
     plt.figure(figsize=(10,6))
-    sns.countplot(data=melted, x='variable', hue='value')
+    sns.barplot(data=melted, x='variable', y='count', hue='value')
     plt.xticks(rotation=45)
     plt.title("Funding Indicators in Successful Startups")
     plt.savefig(FIGURE_PATH + "funding_rounds.png")
@@ -208,17 +417,44 @@ def funding_round_analysis(data):
 # ------------------------------
 # Statistical Summary
 # ------------------------------
-def statistical_analysis(data):
+def summary_table(moments):
+
+    n = np.diag(moments["n"])
+    mean = np.diag(moments["sx"]) / n
+    variance = (np.diag(moments["sxx"]) - n * mean ** 2) / (n - 1)
+
+    return pd.DataFrame({
+        "count": n,
+        "mean": mean,
+        "std": np.sqrt(np.clip(variance, 0, None)),
+        "min": moments["min"],
+        "max": moments["max"],
+    }, index=moments["columns"]).T
+
+
+def statistical_analysis(moments):
     print("\nStatistical Summary:")
-    print(data.describe())
+    print(summary_table(moments))
 
 
 # ------------------------------
 # Correlation Heatmap
 # ------------------------------
-def correlation_plot(data):
+def correlation_matrix(moments):
+    """
+    Pairwise-complete Pearson correlation from the merged moments
+    """
+    n, sx, sxx, sxy = (moments[k] for k in ["n", "sx", "sxx", "sxy"])
 
-    corr = data.select_dtypes(include=['int64','float64']).corr()
+    covariance = n * sxy - sx * sx.T
+    spread = (n * sxx - sx ** 2) * (n * sxx.T - sx.T ** 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = covariance / np.sqrt(spread)
+
+    return pd.DataFrame(corr, index=moments["columns"], columns=moments["columns"])
+
+
+def correlation_plot(corr):
 
     plt.figure(figsize=(14,10))
     sns.heatmap(corr, cmap='coolwarm', annot=False)
@@ -227,26 +463,120 @@ def correlation_plot(data):
     plt.close()
 
 
+# ------------------------------
+# Figure Registry
+# ------------------------------
+# Output file -> (plot function, the slice of the cube it reads). A figure
+# is re-rendered only when its slice, its plotting code, the helpers below
+# or the render settings change.
+FIGURES = {
+    "state_distribution.png": (state_analysis, ['State', 'count']),
+    "category_distribution.png": (category_analysis, ['category', 'count']),
+    "status_distribution.png": (status_distribution, ['status', 'count']),
+    "state_vs_status.png": (state_vs_status, ['State', 'status', 'count']),
+    "category_vs_status.png": (category_vs_status, ['category', 'status', 'count']),
+    "category_vs_year.png": (category_vs_year, ['founded_year', 'category', 'count']),
+    "year_vs_funding.png": (year_vs_funding, ['founded_year'] + FUNDING_BINS),
+    "funding_rounds.png": (funding_round_analysis, ['status', 'count'] + FUNDING_COLS),
+    "correlation_heatmap.png": (correlation_plot, lambda bundle: correlation_matrix(bundle["moments"])),
+}
+
+
+# Code and constants the plot functions share
+FIGURE_HELPERS = [group_counts, sketch_quantile]
+
+
+def shared_fingerprint():
+    """
+    Hash of what every figure depends on besides its own function and data:
+    the shared helpers, the funding bins and the matplotlib/seaborn output
+    settings (versions, backend, rcParams)
+    """
+    digest = hashlib.sha256()
+    for fn in FIGURE_HELPERS:
+        digest.update(inspect.getsource(fn).encode())
+    digest.update(FUNDING_EDGES.tobytes())
+    digest.update(json.dumps(FUNDING_COLS).encode())
+    digest.update(json.dumps([matplotlib.__version__, sns.__version__, matplotlib.get_backend()]).encode())
+    digest.update(json.dumps(sorted((k, str(v)) for k, v in plt.rcParams.items())).encode())
+    return digest.hexdigest()
+
+
+def figure_inputs(bundle, columns):
+    return columns(bundle) if callable(columns) else bundle["cube"][columns]
+
+
+def figure_fingerprint(plot, data_slice, shared):
+    digest = hashlib.sha256(shared.encode())
+    digest.update(inspect.getsource(plot).encode())
+    digest.update(json.dumps([str(c) for c in data_slice.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(data_slice, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def render_figure(name, data_slice):
+    """
+    Runs in a worker process
+    """
+    start = time.perf_counter()
+    FIGURES[name][0](data_slice)
+    return time.perf_counter() - start
+
+
+def load_cache():
+    if os.path.exists(CACHE_PATH):
+        with open(CACHE_PATH) as f:
+            return json.load(f)
+    return {}
+
+
 # ------------------------------
 # Run EDA
 # ------------------------------
-def run_eda():
+def run_eda(workers=None, force=False):
+
+    bundle = build_cube(DATA_PATH)
 
-    data = load_data()
+    cache = {} if force else load_cache()
+    shared = shared_fingerprint()
+    jobs = {}
+    timings = {}
 
-    state_analysis(data)
-    category_analysis(data)
-    status_distribution(data)
-    state_vs_status(data)
-    category_vs_status(data)
-    category_vs_year(data)
-    year_vs_funding(data)
-    funding_round_analysis(data)
-    statistical_analysis(data)
-    correlation_plot(data)
+    for name, (plot, columns) in FIGURES.items():
+        data_slice = figure_inputs(bundle, columns)
+        fingerprint = figure_fingerprint(plot, data_slice, shared)
+
+        if cache.get(name) == fingerprint and os.path.exists(FIGURE_PATH + name):
+            timings[name] = "unchanged"
+            continue
+
+        jobs[name] = (data_slice, fingerprint)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            name: pool.submit(render_figure, name, data_slice)
+            for name, (data_slice, _) in jobs.items()
+        }
+        statistical_analysis(bundle["moments"])
+
+        for name, future in futures.items():
+            timings[name] = "%.2fs" % future.result()
+            cache[name] = jobs[name][1]
+
+    with open(CACHE_PATH, "w") as f:
+        json.dump(cache, f, indent=2)
+
+    print("\nFigure render times:")
+    for name in FIGURES:
+        print("  %-28s %s" % (name, timings[name]))
 
     print("\nAll EDA plots saved in:", FIGURE_PATH)
 
 
 if __name__ == "__main__":
-    run_eda()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Render the EDA figures")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-render every figure")
+    args = parser.parse_args()
+
+    run_eda(workers=args.workers, force=args.force)
@@ -1,26 +1,31 @@
 import pandas as pd
 import os
+import argparse
 from sklearn.model_selection import train_test_split
 
+from split_io import save_split, SPLIT_FORMATS
+from schema import read_dtypes
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_PATH = os.path.join(BASE_DIR, "..", "data", "processed", "startup_processed.csv")
 SPLIT_PATH = os.path.join(BASE_DIR, "..", "data", "split")
 
 os.makedirs(SPLIT_PATH, exist_ok=True)
 
-def feature_engineering():
+def feature_engineering(fmt="csv"):
     if not os.path.exists(DATA_PATH):
         raise FileNotFoundError("Processed file not found! Run preprocessing.py first.")
 
-    data = pd.read_csv(DATA_PATH)
+    # Flags come in as int8, counts as int16, features as float32
+    data = pd.read_csv(DATA_PATH, dtype=read_dtypes())
     print("Loaded Data Shape:", data.shape)
 
     # Separate target
     y = data['status']
     X = data.drop(columns=['status'])
 
-    # Drop string columns
-    string_cols = X.select_dtypes(include=['object']).columns
+    # Drop string and categorical columns
+    string_cols = X.select_dtypes(include=['object', 'category']).columns
     print("Dropping String Columns:", string_cols.tolist())
     X = X.drop(columns=string_cols)
 
@@ -33,12 +38,17 @@ def feature_engineering():
     print("Testing Shape:", X_test.shape)
 
     # Save split data
-    X_train.to_csv(os.path.join(SPLIT_PATH, "X_train.csv"), index=False)
-    X_test.to_csv(os.path.join(SPLIT_PATH, "X_test.csv"), index=False)
-    y_train.to_csv(os.path.join(SPLIT_PATH, "y_train.csv"), index=False)
-    y_test.to_csv(os.path.join(SPLIT_PATH, "y_test.csv"), index=False)
+    save_split(
+        SPLIT_PATH, fmt=fmt,
+        X_train=X_train, X_test=X_test, y_train=y_train, y_test=y_test
+    )
 
     print("✅ Train-Test Split Saved Successfully at:", SPLIT_PATH)
 
 if __name__ == "__main__":
-    feature_engineering()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Split processed data into train/test sets")
+    parser.add_argument("--format", choices=SPLIT_FORMATS, default="csv",
+                        help="csv, or npy (typed matrices + schema.json, memory-mappable)")
+    args = parser.parse_args()
+
+    feature_engineering(fmt=args.format)
\ No newline at end of file
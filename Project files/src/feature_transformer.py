@@ -0,0 +1,125 @@
+import numpy as np
+
+__all__ = ["FeatureTransformer", "REFERENCE_YEAR"]
+
+# Year startup_age is measured against (see preprocessing.py)
+REFERENCE_YEAR = 2023
+
+# Request field names that differ from the training column names
+FIELD_ALIASES = {
+    "has_vc": "has_VC",
+}
+
+
+def to_number(value):
+    """
+    Convert a request value ("Yes"/"No", bool, number string) to float
+    """
+    if value is None:
+        return 0.0
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("yes", "true"):
+            return 1.0
+        if lowered in ("no", "false", ""):
+            return 0.0
+    return float(value)
+
+
+class FeatureTransformer:
+    """
+    Turns training frames and request payloads into the model's float32
+    feature matrix.
+
+    Fitted once on X_train by train.py and saved next to the model, so
+    training and both backends share one column order, one set of field
+    aliases and one definition of derived features.
+    """
+
+    def __init__(self, aliases=None, reference_year=REFERENCE_YEAR):
+        self.aliases = dict(FIELD_ALIASES if aliases is None else aliases)
+        self.reference_year = reference_year
+
+    def fit(self, X, y=None):
+        """
+        Learn the column order from the training frame
+        """
+        return self.fit_columns(list(X.columns))
+
+    def fit_columns(self, columns):
+        self.columns_ = list(columns)
+        self.n_features_in_ = len(self.columns_)
+
+        # Request field -> matrix column, aliases included
+        self.field_index_ = {col: i for i, col in enumerate(self.columns_)}
+        for field, col in self.aliases.items():
+            if col in self.field_index_:
+                self.field_index_[field] = self.field_index_[col]
+        return self
+
+    @classmethod
+    def from_columns(cls, columns):
+        return cls().fit_columns(columns)
+
+    def transform(self, X, out=None):
+        """
+        Build the (n, n_features) float32 matrix from a DataFrame, a single
+        record dict or a list of record dicts. Records are filled column by
+        column; fields that are not model features are ignored and missing
+        features stay 0.
+        """
+        if hasattr(X, "columns"):
+            return self._transform_frame(X)
+
+        records = [X] if isinstance(X, dict) else X
+        if out is None:
+            out = np.zeros((len(records), self.n_features_in_), dtype=np.float32)
+        else:
+            out[:] = 0
+
+        fields = set().union(*records)
+        for field in fields:
+            idx = self.field_index_.get(field)
+            if idx is not None:
+                out[:, idx] = [to_number(record.get(field)) for record in records]
+
+        has_year = np.array(["founded_year" in record for record in records])
+        self.derive(out, fields, has_year)
+        return out
+
+    def _transform_frame(self, frame):
+        """
+        Training frames carry every column; files sent for scoring may only
+        carry some of them (or request-style fields), so those are filled
+        like records, one column at a time. Missing values become 0 either way.
+        """
+        if set(self.columns_).issubset(frame.columns):
+            return frame[self.columns_].to_numpy(dtype=np.float32, na_value=0)
+
+        out = np.zeros((len(frame), self.n_features_in_), dtype=np.float32)
+        for field in frame.columns:
+            idx = self.field_index_.get(field)
+            if idx is None:
+                continue
+            column = frame[field]
+            if column.dtype.kind not in "biuf":
+                column = column.map(to_number)
+            out[:, idx] = column.to_numpy(dtype=np.float32, na_value=0)
+
+        has_year = frame["founded_year"].notna().to_numpy() if "founded_year" in frame.columns else None
+        self.derive(out, set(frame.columns), has_year)
+        return out
+
+    def derive(self, out, fields, has_year=None):
+        """
+        Fill features that preprocessing derives from other columns, unless
+        the caller supplied them. `fields` are the input fields present;
+        `has_year` masks rows that actually carry founded_year (all by default).
+        """
+        index = self.field_index_
+        if "startup_age" in index and "founded_year" in fields and "startup_age" not in fields:
+            age = self.reference_year - out[:, index["founded_year"]]
+            out[:, index["startup_age"]] = age if has_year is None else np.where(has_year, age, 0)
+
+    def fit_transform(self, X, y=None):
+        return self.fit(X).transform(X)
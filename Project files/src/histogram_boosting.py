@@ -0,0 +1,318 @@
+import os
+import tempfile
+
+import numpy as np
+
+__all__ = ["BinMapper", "ReservoirSample", "StreamingBoostingClassifier"]
+
+# Quantile edges per feature; bin codes fit in a uint8
+DEFAULT_MAX_BINS = 255
+
+# Rows kept for fitting the bin edges (sklearn's HistGradientBoosting
+# subsamples the same amount for its binning)
+DEFAULT_SAMPLE_SIZE = 200_000
+
+
+class ReservoirSample:
+    """
+    Uniform sample of at most `size` rows from a stream of chunks, so the
+    bin edges come from the whole file without holding it in memory
+    """
+
+    def __init__(self, size=DEFAULT_SAMPLE_SIZE, seed=0):
+        self.size = size
+        self.rows = None
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, chunk):
+        chunk = np.asarray(chunk)
+        if self.rows is None:
+            self.rows = np.empty((self.size, chunk.shape[1]), dtype=chunk.dtype)
+
+        fill = min(max(self.size - self.seen, 0), len(chunk))
+        self.rows[self.seen:self.seen + fill] = chunk[:fill]
+
+        # Algorithm R: row i of the stream replaces a random slot with
+        # probability size / (i + 1)
+        positions = np.arange(self.seen + fill, self.seen + len(chunk))
+        slots = (self._rng.random(len(positions)) * (positions + 1)).astype(np.int64)
+        keep = slots < self.size
+        self.rows[slots[keep]] = chunk[fill:][keep]
+
+        self.seen += len(chunk)
+
+    @property
+    def values(self):
+        return self.rows[:min(self.seen, self.size)]
+
+
+class BinMapper:
+    """
+    Maps each feature to uint8 bin codes by quantile edges; features with
+    fewer distinct values than bins get one bin per value. A value's code
+    is the number of edges at or below it, so code <= t means x < edges[t].
+    """
+
+    def __init__(self, max_bins=DEFAULT_MAX_BINS):
+        if not 2 <= max_bins <= 256:
+            raise ValueError("max_bins must be between 2 and 256, got %d" % max_bins)
+        self.max_bins = max_bins
+
+    def fit(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        self.edges_ = []
+        for j in range(X.shape[1]):
+            distinct = np.unique(X[:, j])
+            if len(distinct) <= self.max_bins:
+                # Midpoints between neighbouring values
+                edges = (distinct[:-1] + distinct[1:]) / 2
+            else:
+                quantiles = np.linspace(0, 1, self.max_bins + 1)[1:-1]
+                edges = np.unique(np.quantile(X[:, j], quantiles))
+            self.edges_.append(edges.astype(np.float32))
+        self.n_bins_ = np.array([len(e) + 1 for e in self.edges_])
+        return self
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        codes = np.empty(X.shape, dtype=np.uint8)
+        for j, edges in enumerate(self.edges_):
+            codes[:, j] = np.searchsorted(edges, X[:, j], side="right")
+        return codes
+
+
+class StreamingBoostingClassifier:
+    """
+    Gradient-boosted trees (log loss, binary) trained on uint8 bin codes
+    that are streamed in chunks, so memory depends on the histograms
+    (nodes x features x bins) and the chunk size, not on the row count.
+
+    fit_stream makes two passes over the source (sample for the bin edges,
+    then bin every chunk into a uint8 file on disk) and afterwards reads
+    only that file: one pass per tree level to build gradient histograms
+    and one to update the scores. The fitted trees split on raw feature
+    values, so predict_proba takes the float32 matrix the backends build.
+    """
+
+    def __init__(self, n_estimators=100, learning_rate=0.1, max_depth=4,
+                 min_samples_leaf=20, l2_regularization=1.0, max_bins=DEFAULT_MAX_BINS,
+                 class_weight="balanced", chunksize=100_000, random_state=0):
+        self.n_estimators = n_estimators
+        self.learning_rate = learning_rate
+        self.max_depth = max_depth
+        self.min_samples_leaf = min_samples_leaf
+        self.l2_regularization = l2_regularization
+        self.max_bins = max_bins
+        self.class_weight = class_weight
+        self.chunksize = chunksize
+        self.random_state = random_state
+
+    # ---------------------------------
+    # Training
+    # ---------------------------------
+    def fit_stream(self, chunks, sample=None, workdir=None):
+        """
+        `chunks` is a callable returning a fresh iterator of (X, y) chunks,
+        X a float32 matrix and y the 0/1 labels. Pass a ReservoirSample to
+        keep the rows the bin edges were fitted on.
+        """
+        sample = sample if sample is not None else ReservoirSample(seed=self.random_state)
+        class_counts = np.zeros(2, dtype=np.int64)
+        for X, y in chunks():
+            sample.add(X)
+            class_counts += np.bincount(np.asarray(y, dtype=np.int64), minlength=2)[:2]
+
+        n_rows = int(class_counts.sum())
+        if n_rows == 0 or class_counts.min() == 0:
+            raise ValueError("Training data needs rows of both classes, got counts %s" % class_counts.tolist())
+
+        self.classes_ = np.array([0, 1])
+        self.n_features_in_ = sample.values.shape[1]
+        self.bin_mapper_ = BinMapper(self.max_bins).fit(sample.values)
+        self.n_rows_ = n_rows
+
+        if self.class_weight == "balanced":
+            class_weights = n_rows / (2 * class_counts)
+        else:
+            class_weights = np.ones(2)
+        positive = class_weights[1] * class_counts[1]
+        self.baseline_ = float(np.log(positive / (class_weights[0] * class_counts[0])))
+
+        with tempfile.TemporaryDirectory(prefix="prosperity-bins-", dir=workdir) as tmp:
+            codes = np.lib.format.open_memmap(os.path.join(tmp, "codes.npy"), mode="w+",
+                                              dtype=np.uint8, shape=(n_rows, self.n_features_in_))
+            labels = np.lib.format.open_memmap(os.path.join(tmp, "labels.npy"), mode="w+",
+                                               dtype=np.int8, shape=(n_rows,))
+            offset = 0
+            for X, y in chunks():
+                codes[offset:offset + len(X)] = self.bin_mapper_.transform(X)
+                labels[offset:offset + len(X)] = y
+                offset += len(X)
+
+            scores = np.lib.format.open_memmap(os.path.join(tmp, "scores.npy"), mode="w+",
+                                               dtype=np.float32, shape=(n_rows,))
+            scores[:] = self.baseline_
+
+            self.trees_ = []
+            for _ in range(self.n_estimators):
+                tree = self._grow_tree(codes, labels, scores, class_weights)
+                self.trees_.append(tree)
+                for start in range(0, n_rows, self.chunksize):
+                    end = start + self.chunksize
+                    scores[start:end] += tree["value"][self._apply_binned(tree, codes[start:end])]
+
+            del codes, labels, scores
+
+        self._to_raw_thresholds()
+        return self
+
+    def _gradients(self, labels, scores, class_weights):
+        p = 1 / (1 + np.exp(-scores.astype(np.float64)))
+        weight = class_weights[labels]
+        return weight * (p - labels), weight * p * (1 - p)
+
+    def _grow_tree(self, codes, labels, scores, class_weights):
+        """
+        Level-wise growth: each level is one pass over the binned rows that
+        fills gradient, hessian and count histograms for the open nodes
+        """
+        n_features, n_bins = self.n_features_in_, self.max_bins
+        tree = {"feature": [-1], "bin": [0], "left": [-1], "right": [-1], "value": [0.0]}
+        open_nodes = [0]
+
+        for depth in range(self.max_depth):
+            if not open_nodes:
+                break
+            slot = {node: i for i, node in enumerate(open_nodes)}
+            size = len(open_nodes) * n_features * n_bins
+            grad_hist = np.zeros(size)
+            hess_hist = np.zeros(size)
+            count_hist = np.zeros(size)
+
+            for start in range(0, len(codes), self.chunksize):
+                chunk = np.asarray(codes[start:start + self.chunksize])
+                nodes = self._apply_binned(tree, chunk)
+                slots = np.array([slot.get(n, -1) for n in range(len(tree["feature"]))])[nodes]
+                rows = slots >= 0
+                if not rows.any():
+                    continue
+
+                grad, hess = self._gradients(labels[start:start + self.chunksize][rows],
+                                             scores[start:start + self.chunksize][rows], class_weights)
+                index = ((slots[rows, np.newaxis] * n_features + np.arange(n_features)) * n_bins
+                         + chunk[rows]).ravel()
+                grad_hist += np.bincount(index, np.repeat(grad, n_features), minlength=size)
+                hess_hist += np.bincount(index, np.repeat(hess, n_features), minlength=size)
+                count_hist += np.bincount(index, minlength=size)
+
+            shape = (len(open_nodes), n_features, n_bins)
+            grad_hist, hess_hist, count_hist = (h.reshape(shape) for h in (grad_hist, hess_hist, count_hist))
+
+            next_open = []
+            for node in open_nodes:
+                split = self._best_split(grad_hist[slot[node]], hess_hist[slot[node]], count_hist[slot[node]])
+                totals = (grad_hist[slot[node], 0].sum(), hess_hist[slot[node], 0].sum())
+                tree["value"][node] = self._leaf_value(*totals)
+                if split is None:
+                    continue
+
+                feature, threshold, left_totals, right_totals = split
+                tree["feature"][node] = feature
+                tree["bin"][node] = threshold
+                for side, child_totals in [("left", left_totals), ("right", right_totals)]:
+                    child = len(tree["feature"])
+                    tree[side][node] = child
+                    for key, default in [("feature", -1), ("bin", 0), ("left", -1), ("right", -1)]:
+                        tree[key].append(default)
+                    tree["value"].append(self._leaf_value(*child_totals))
+                    if depth + 1 < self.max_depth:
+                        next_open.append(child)
+            open_nodes = next_open
+
+        tree = {key: np.array(values) for key, values in tree.items()}
+        tree["value"] = tree["value"].astype(np.float32)
+        return tree
+
+    def _leaf_value(self, grad, hess):
+        return -self.learning_rate * grad / (hess + self.l2_regularization)
+
+    def _best_split(self, grad, hess, count):
+        """
+        Best (feature, bin) split of one node from its histograms, or None.
+        Rows with code <= bin go left.
+        """
+        lam = self.l2_regularization
+        grad_left, hess_left, count_left = grad.cumsum(axis=1), hess.cumsum(axis=1), count.cumsum(axis=1)
+        grad_total, hess_total, count_total = grad_left[:, -1:], hess_left[:, -1:], count_left[:, -1:]
+        grad_right, hess_right = grad_total - grad_left, hess_total - hess_left
+
+        gain = (grad_left ** 2 / (hess_left + lam) + grad_right ** 2 / (hess_right + lam)
+                - grad_total ** 2 / (hess_total + lam))
+        valid = (count_left >= self.min_samples_leaf) & (count_total - count_left >= self.min_samples_leaf)
+        gain = np.where(valid, gain, -np.inf)
+
+        feature, threshold = np.unravel_index(np.argmax(gain), gain.shape)
+        if not gain[feature, threshold] > 0:
+            return None
+        return (int(feature), int(threshold),
+                (grad_left[feature, threshold], hess_left[feature, threshold]),
+                (grad_right[feature, threshold], hess_right[feature, threshold]))
+
+    # ---------------------------------
+    # Prediction
+    # ---------------------------------
+    @staticmethod
+    def _apply_binned(tree, codes):
+        """
+        Node reached by every row of a binned chunk, one level at a time
+        (also called on the tree being grown, whose fields are still lists)
+        """
+        tree = {key: np.asarray(tree[key]) for key in ["feature", "bin", "left", "right"]}
+        nodes = np.zeros(len(codes), dtype=np.int64)
+        rows = np.arange(len(codes))
+        while True:
+            feature = tree["feature"][nodes]
+            inner = feature >= 0
+            if not inner.any():
+                return nodes
+            go_left = codes[rows[inner], feature[inner]] <= tree["bin"][nodes[inner]]
+            nodes[inner] = np.where(go_left, tree["left"][nodes[inner]], tree["right"][nodes[inner]])
+
+    def _to_raw_thresholds(self):
+        """
+        code <= t  <=>  x < edges[t], so trees can split raw values
+        """
+        for tree in self.trees_:
+            threshold = np.full(len(tree["feature"]), np.inf, dtype=np.float32)
+            for node in np.flatnonzero(tree["feature"] >= 0):
+                edges = self.bin_mapper_.edges_[tree["feature"][node]]
+                if tree["bin"][node] < len(edges):
+                    threshold[node] = edges[tree["bin"][node]]
+            tree["threshold"] = threshold
+
+    def decision_function(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError("Expected a matrix with %d features, got shape %s" % (self.n_features_in_, X.shape))
+
+        scores = np.full(len(X), self.baseline_)
+        rows = np.arange(len(X))
+        for tree in self.trees_:
+            nodes = np.zeros(len(X), dtype=np.int64)
+            while True:
+                feature = tree["feature"][nodes]
+                inner = feature >= 0
+                if not inner.any():
+                    break
+                go_left = X[rows[inner], feature[inner]] < tree["threshold"][nodes[inner]]
+                nodes[inner] = np.where(go_left, tree["left"][nodes[inner]], tree["right"][nodes[inner]])
+            scores += tree["value"][nodes]
+        return scores
+
+    def predict_proba(self, X):
+        p = 1 / (1 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(np.int64)]
@@ -0,0 +1,196 @@
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+# Fingerprint of the last successful run of every stage
+CACHE_PATH = os.path.join(PROJECT_DIR, "data", ".pipeline_cache.json")
+
+EDA_FIGURES = [
+    "state_distribution.png", "category_distribution.png", "status_distribution.png",
+    "state_vs_status.png", "category_vs_status.png", "category_vs_year.png",
+    "year_vs_funding.png", "funding_rounds.png", "correlation_heatmap.png",
+]
+
+
+class Stage:
+    """
+    One step of the pipeline: `module.function(**params)` reads `inputs`,
+    writes `outputs` and runs after the stages in `deps`. `code` lists the
+    modules whose source is part of the fingerprint: src/ module names, or
+    project-relative paths such as "backend/drift". External stages
+    (the Kaggle download) are trusted whenever their outputs exist.
+    """
+
+    def __init__(self, name, module, function, inputs=(), outputs=(), deps=(),
+                 code=(), params=None, external=False):
+        self.name = name
+        self.module = module
+        self.function = function
+        self.inputs = [os.path.join(PROJECT_DIR, p) for p in inputs]
+        self.outputs = [os.path.join(PROJECT_DIR, p) for p in outputs]
+        self.deps = list(deps)
+        self.code = [module] + list(code)
+        self.params = params or {}
+        self.external = external
+
+
+def build_stages(split_format="csv", grow=False):
+    split_files = ["data/split/%s.%s" % (name, split_format)
+                   for name in ["X_train", "X_test", "y_train", "y_test"]]
+    raw = "data/raw/startup data.csv"
+    processed = "data/processed/startup_processed.csv"
+
+    return [
+        Stage("data_collection", "data_collection", "download_dataset",
+              outputs=[raw], external=True),
+        Stage("preprocessing", "preprocessing", "preprocess_data",
+              inputs=[raw], outputs=[processed], deps=["data_collection"],
+              code=["feature_transformer", "schema"]),
+        Stage("eda", "eda", "run_eda",
+              inputs=[raw], outputs=["reports/figures/" + f for f in EDA_FIGURES],
+              deps=["data_collection"]),
+        Stage("feature_engineering", "feature_engineering", "feature_engineering",
+              inputs=[processed], outputs=split_files, deps=["preprocessing"],
+              code=["split_io", "schema"], params={"fmt": split_format}),
+        Stage("train", "train", "train_model",
+              inputs=split_files,
+              outputs=["models/startup_success_model.pkl", "models/feature_columns.pkl",
+                       "models/feature_transformer.pkl", "models/model_compact.npz",
+                       "models/drift_reference.json"],
+              deps=["feature_engineering"],
+              code=["feature_transformer", "histogram_boosting", "split_io", "schema", "backend/drift",
+                    "backend/compiled_forest"],
+              params={"grow": grow}),
+    ]
+
+
+def file_hash(path, digest=None):
+    digest = digest or hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest
+
+
+def module_path(module):
+    if "/" in module:
+        return os.path.join(PROJECT_DIR, module + ".py")
+    return os.path.join(BASE_DIR, module + ".py")
+
+
+def fingerprint(stage):
+    """
+    Hash of everything that determines the stage's outputs: its inputs'
+    contents, the source of the modules it runs and its parameters
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([stage.name, stage.function, stage.params], sort_keys=True).encode())
+    for module in stage.code:
+        file_hash(module_path(module), digest)
+    for path in stage.inputs:
+        file_hash(path, digest)
+    return digest.hexdigest()
+
+
+def is_cached(stage, cache):
+    if not all(os.path.exists(p) for p in stage.outputs):
+        return False
+    if stage.external:
+        return True
+    return cache.get(stage.name) == fingerprint(stage)
+
+
+def run_stage(module, function, params):
+    """
+    Runs in a worker process
+    """
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    start = time.perf_counter()
+    getattr(importlib.import_module(module), function)(**params)
+    return time.perf_counter() - start
+
+
+def load_cache():
+    if os.path.exists(CACHE_PATH):
+        with open(CACHE_PATH) as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache):
+    with open(CACHE_PATH, "w") as f:
+        json.dump(cache, f, indent=2)
+
+
+def run_pipeline(stages, workers=2, force=False):
+    """
+    Run stages in dependency order, skipping those whose fingerprint matches
+    the last successful run and running independent stages (eda and the
+    preprocessing -> feature_engineering -> train chain) in parallel
+    """
+    cache = {} if force else load_cache()
+    pending = {stage.name: stage for stage in stages}
+    done = set()
+    running = {}
+    report = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if not all(dep in done for dep in stage.deps):
+                    continue
+                del pending[name]
+
+                # Fingerprints are taken when a stage becomes ready, after
+                # its upstream stages have rewritten their outputs
+                if is_cached(stage, cache):
+                    done.add(name)
+                    report[name] = ("hit", 0.0)
+                    print("⏭  %-20s cache hit" % name)
+                    continue
+
+                print("▶  %-20s running" % name)
+                future = pool.submit(run_stage, stage.module, stage.function, stage.params)
+                running[future] = stage
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                seconds = future.result()
+                if not stage.external:
+                    cache[stage.name] = fingerprint(stage)
+                    save_cache(cache)
+                done.add(stage.name)
+                report[stage.name] = ("miss", seconds)
+                print("✅ %-20s finished in %.2fs" % (stage.name, seconds))
+
+    hits = sum(1 for status, _ in report.values() if status == "hit")
+    print("\nStage timings:")
+    for name, (status, seconds) in report.items():
+        print("  %-20s %-4s %8.2fs" % (name, status, seconds))
+    print("Cache hits: %d, misses: %d" % (hits, len(report) - hits))
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the data -> model pipeline with stage caching")
+    parser.add_argument("--workers", type=int, default=2, help="parallel stage processes")
+    parser.add_argument("--force", action="store_true", help="ignore the cache and rerun every stage")
+    parser.add_argument("--split-format", choices=["csv", "npy"], default="csv")
+    parser.add_argument("--grow", action="store_true", help="train with the warm-start growth mode")
+    args = parser.parse_args()
+
+    run_pipeline(build_stages(args.split_format, args.grow), workers=args.workers, force=args.force)
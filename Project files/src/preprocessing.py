@@ -1,56 +1,93 @@
 import pandas as pd
 import numpy as np
 import os
+import argparse
 
-DATA_PATH = "../data/raw/startup data.csv"
-PROCESSED_PATH = "../data/processed/"
-os.makedirs(PROCESSED_PATH, exist_ok=True)
-
-
-def preprocess_data():
+from feature_transformer import REFERENCE_YEAR
+from schema import read_dtypes, apply_schema
 
-    data = pd.read_csv(DATA_PATH)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, "..", "data", "raw", "startup data.csv")
+PROCESSED_PATH = os.path.join(BASE_DIR, "..", "data", "processed", "")
+os.makedirs(PROCESSED_PATH, exist_ok=True)
 
-    print("Original Shape:", data.shape)
+TOP_STATES = ['CA', 'NY', 'MA', 'TX', 'WA']
+
+# Raw dates look like 1/1/2007; an explicit format avoids per-value inference
+DATE_FORMAT = "%m/%d/%Y"
+DATE_COLS = [
+    'founded_at',
+    'closed_at',
+    'first_funding_at',
+    'last_funding_at'
+]
+
+DROP_COLS = [
+    'category_code',
+    'is_software',
+    'is_web',
+    'is_mobile',
+    'is_enterprise',
+    'is_advertising',
+    'is_gamesvideo',
+    'is_ecommerce',
+    'is_biotech',
+    'is_consulting',
+    'is_othercategory',
+    'city',
+    'labels',
+    'zip_code',
+    'object_id',
+    'name'
+]
+
+def read_raw(path, **kwargs):
+    """
+    Read the raw CSV with the compact dtype plan, skipping DROP_COLS
+    entirely instead of parsing them only to drop them later
+    """
+    return pd.read_csv(path, dtype=read_dtypes(raw=True),
+                       usecols=lambda col: col not in DROP_COLS, **kwargs)
+
+
+# Rows per chunk in streaming mode
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def transform_chunk(data, compact=True):
+    """
+    Apply every preprocessing step to a frame (the whole file or one chunk).
+    All steps are vectorized and row-local, so chunks can be processed
+    independently and concatenated. compact=False keeps pandas' default
+    int64/float64/object dtypes (only used to benchmark the dtype plan).
+    """
 
     # ---------------------------------
     # 1. Fix State Columns
     # ---------------------------------
     if 'state_code.1' in data.columns:
-        print("State columns equal:",
-              data['state_code'].equals(data['state_code.1']))
-
         # Drop duplicate column
         data = data.drop(columns=['state_code.1'])
 
     # ---------------------------------
     # 2. Reduce State Categories
     # ---------------------------------
-    top_states = ['CA', 'NY', 'MA', 'TX', 'WA']
-
-    data['state_reduced'] = data['state_code'].apply(
-        lambda x: x if x in top_states else 'other'
+    data['state_reduced'] = data['state_code'].astype(object).where(
+        data['state_code'].isin(TOP_STATES), 'other'
     )
 
     # ---------------------------------
     # 3. Convert Date Columns
     # ---------------------------------
-    date_cols = [
-        'founded_at',
-        'closed_at',
-        'first_funding_at',
-        'last_funding_at'
-    ]
-
-    for col in date_cols:
+    for col in DATE_COLS:
         if col in data.columns:
-            data[col] = pd.to_datetime(data[col], errors='coerce')
+            data[col] = pd.to_datetime(data[col], format=DATE_FORMAT, errors='coerce')
 
     # Create founded_year
     data['founded_year'] = data['founded_at'].dt.year
 
     # Startup age (till 2023)
-    data['startup_age'] = 2023 - data['founded_year']
+    data['startup_age'] = REFERENCE_YEAR - data['founded_year']
 
     # ---------------------------------
     # 4. Clean Funding Column
@@ -70,36 +107,75 @@ def preprocess_data():
     # ---------------------------------
     # 6. Drop Irrelevant Columns
     # ---------------------------------
-    drop_cols = [
-        'category_code',
-        'is_software',
-        'is_web',
-        'is_mobile',
-        'is_enterprise',
-        'is_advertising',
-        'is_gamesvideo',
-        'is_ecommerce',
-        'is_biotech',
-        'is_consulting',
-        'is_othercategory',
-        'city',
-        'labels',
-        'zip_code',
-        'object_id',
-        'name'
-    ]
-
-    data = data.drop(columns=[c for c in drop_cols if c in data.columns])
+    data = data.drop(columns=[c for c in DROP_COLS if c in data.columns])
 
     # ---------------------------------
     # 7. Handle Missing Values
     # ---------------------------------
-    data = data.fillna(0)
+    if not compact:
+        return data.fillna(0)
+
+    # Only numeric gaps become 0; filling text, date or categorical columns
+    # with 0 would turn them into mixed object columns. Those are all
+    # dropped before training, so missing values there stay missing.
+    numeric_cols = data.select_dtypes(include='number').columns
+    data[numeric_cols] = data[numeric_cols].fillna(0)
+
+    # ---------------------------------
+    # 8. Compact Dtypes
+    # ---------------------------------
+    data = apply_schema(data)
+
+    return data
+
+
+def iter_preprocessed_chunks(path=DATA_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Generator over preprocessed chunks of the raw file; memory stays
+    bounded by chunksize no matter how large the input is
+    """
+    for chunk in read_raw(path, chunksize=chunksize):
+        yield transform_chunk(chunk)
+
+
+def preprocess_streaming(chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Stream the raw file through transform_chunk and append each chunk to
+    the processed CSV as soon as it is ready
+    """
+    output_path = PROCESSED_PATH + "startup_processed.csv"
+    rows = 0
+
+    for i, chunk in enumerate(iter_preprocessed_chunks(DATA_PATH, chunksize)):
+        chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        rows += len(chunk)
+
+    print("Final Rows After Preprocessing:", rows)
+    print("Processed file saved successfully.")
+
+    return output_path
+
+
+def preprocess_data(chunksize=None):
+
+    if chunksize:
+        return preprocess_streaming(chunksize)
+
+    data = read_raw(DATA_PATH)
+
+    print("Original Shape (without DROP_COLS):", data.shape)
+
+    if 'state_code.1' in data.columns:
+        print("State columns equal:",
+              data['state_code'].equals(data['state_code.1']))
+
+    data = transform_chunk(data)
 
     print("Final Shape After Preprocessing:", data.shape)
+    print("Memory Usage: %.2f MB" % (data.memory_usage(deep=True).sum() / 1e6))
 
     # ---------------------------------
-    # 8. Save Processed Data
+    # 9. Save Processed Data
     # ---------------------------------
     data.to_csv(PROCESSED_PATH + "startup_processed.csv", index=False)
 
@@ -109,4 +185,9 @@ def preprocess_data():
 
 
 if __name__ == "__main__":
-    preprocess_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Preprocess the raw startup dataset")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="stream the raw file in chunks of this many rows")
+    args = parser.parse_args()
+
+    preprocess_data(chunksize=args.chunksize)
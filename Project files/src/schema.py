@@ -0,0 +1,74 @@
+import numpy as np
+
+__all__ = ["DTYPE_PLAN", "FLAG_COLUMNS", "COUNT_COLUMNS", "FLOAT_COLUMNS",
+           "CATEGORY_COLUMNS", "read_dtypes", "apply_schema"]
+
+# ---------------------------------
+# Dtype Plan
+# ---------------------------------
+# Without a plan pandas reads every number as int64/float64 and every
+# string as object. The model only ever sees float32 (sklearn trees cast
+# to it internally), so nothing below loses information it would use.
+
+# 0/1 indicators and the target
+FLAG_COLUMNS = [
+    'is_CA', 'is_NY', 'is_MA', 'is_TX', 'is_otherstate',
+    'is_software', 'is_web', 'is_mobile', 'is_enterprise', 'is_advertising',
+    'is_gamesvideo', 'is_ecommerce', 'is_biotech', 'is_consulting', 'is_othercategory',
+    'has_VC', 'has_angel', 'has_roundA', 'has_roundB', 'has_roundC', 'has_roundD',
+    'is_top500', 'status'
+]
+
+# Small non-negative integers (years fit easily in int16)
+COUNT_COLUMNS = [
+    'labels', 'relationships', 'funding_rounds', 'milestones',
+    'founded_year', 'startup_age'
+]
+
+# Continuous features; 'Unnamed: 0' is the row number the dataset ships with
+FLOAT_COLUMNS = [
+    'Unnamed: 0', 'latitude', 'longitude',
+    'age_first_funding_year', 'age_last_funding_year',
+    'age_first_milestone_year', 'age_last_milestone_year',
+    'funding_total_usd', 'avg_participants'
+]
+
+# Low-cardinality strings
+CATEGORY_COLUMNS = [
+    'state_code', 'state_code.1', 'state_reduced', 'category_code', 'city'
+]
+
+DTYPE_PLAN = {
+    **{col: np.int8 for col in FLAG_COLUMNS},
+    **{col: np.int16 for col in COUNT_COLUMNS},
+    **{col: np.float32 for col in FLOAT_COLUMNS},
+    **{col: "category" for col in CATEGORY_COLUMNS},
+}
+
+
+def read_dtypes(raw=False):
+    """
+    dtype= mapping for pd.read_csv. Raw files can have gaps in the integer
+    columns, so those are read as float32 and narrowed by apply_schema once
+    preprocessing has filled them; processed and split files are complete.
+    The raw target is a string ('acquired'/'closed') and is left alone.
+    """
+    if not raw:
+        return dict(DTYPE_PLAN)
+
+    return {
+        col: np.float32 if dtype in (np.int8, np.int16) else dtype
+        for col, dtype in DTYPE_PLAN.items()
+        if col != 'status'
+    }
+
+
+def apply_schema(data):
+    """
+    Cast the planned columns present in `data` to their compact dtype
+    """
+    plan = {
+        col: dtype for col, dtype in DTYPE_PLAN.items()
+        if col in data.columns and data[col].dtype != dtype
+    }
+    return data.astype(plan) if plan else data
@@ -0,0 +1,136 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from schema import read_dtypes
+
+__all__ = ["save_split", "load_split", "iter_split", "SPLIT_NAMES", "SPLIT_FORMATS"]
+
+SPLIT_NAMES = ["X_train", "X_test", "y_train", "y_test"]
+SPLIT_FORMATS = ["csv", "npy"]
+
+# Sidecar describing the .npy split files (columns, dtypes, shapes)
+SCHEMA_FILE = "schema.json"
+
+
+def save_split(split_path, fmt="csv", **frames):
+    """
+    Save the train/test frames as CSV (default) or as typed .npy matrices
+    plus a schema.json sidecar. Writing CSV removes a stale sidecar so the
+    loaders never pick up .npy files from an older run.
+    """
+    if fmt not in SPLIT_FORMATS:
+        raise ValueError("Unknown split format %r, expected one of %s" % (fmt, SPLIT_FORMATS))
+
+    schema_path = os.path.join(split_path, SCHEMA_FILE)
+
+    if fmt == "csv":
+        for name, frame in frames.items():
+            frame.to_csv(os.path.join(split_path, name + ".csv"), index=False)
+        if os.path.exists(schema_path):
+            os.remove(schema_path)
+        return
+
+    schema = {}
+    for name, frame in frames.items():
+        frame = frame.to_frame() if isinstance(frame, pd.Series) else frame
+        values = frame.to_numpy()
+        np.save(os.path.join(split_path, name + ".npy"), np.ascontiguousarray(values))
+        schema[name] = {
+            "columns": frame.columns.tolist(),
+            "dtypes": {col: str(dtype) for col, dtype in frame.dtypes.items()},
+            "matrix_dtype": str(values.dtype),
+            "shape": list(values.shape),
+        }
+
+    with open(schema_path, "w") as f:
+        json.dump(schema, f, indent=2)
+
+
+def _with_dtypes(frame, dtypes):
+    """
+    Restore the per-column dtypes recorded in schema.json: the .npy matrix
+    holds one common dtype, so int8 flags and int16 counts come back widened
+    """
+    plan = {col: dtype for col, dtype in dtypes.items() if str(frame[col].dtype) != dtype}
+    return frame.astype(plan) if plan else frame
+
+
+def _has_npy(split_path, names):
+    schema_path = os.path.join(split_path, SCHEMA_FILE)
+    return os.path.exists(schema_path) and all(
+        os.path.exists(os.path.join(split_path, name + ".npy")) for name in names
+    )
+
+
+def load_split(split_path, names=SPLIT_NAMES, fmt="auto", mmap_mode="r"):
+    """
+    Load split files as a dict of frames (X_*) and 1-D arrays (y_*).
+    With fmt="auto" the .npy files are used when present, memory-mapped so
+    nothing is parsed, and columns are cast back to their saved dtypes;
+    otherwise the CSV files are read with the schema's compact dtypes.
+    """
+    if fmt == "auto":
+        fmt = "npy" if _has_npy(split_path, names) else "csv"
+
+    missing = [
+        name for name in names
+        if not os.path.exists(os.path.join(split_path, name + "." + fmt))
+    ]
+    if missing:
+        raise FileNotFoundError(
+            "❌ %s not found in %s! Run feature_engineering.py first." % (", ".join(missing), split_path)
+        )
+
+    if fmt == "csv":
+        frames = {
+            name: pd.read_csv(os.path.join(split_path, name + ".csv"), dtype=read_dtypes())
+            for name in names
+        }
+    else:
+        with open(os.path.join(split_path, SCHEMA_FILE)) as f:
+            schema = json.load(f)
+        frames = {
+            name: _with_dtypes(pd.DataFrame(
+                np.load(os.path.join(split_path, name + ".npy"), mmap_mode=mmap_mode),
+                columns=schema[name]["columns"],
+                copy=False,
+            ), schema[name]["dtypes"])
+            for name in names
+        }
+
+    return {
+        name: frame.to_numpy().ravel() if name.startswith("y_") else frame
+        for name, frame in frames.items()
+    }
+
+
+def iter_split(split_path, name, chunksize, fmt="auto"):
+    """
+    Yield one split file in chunks of `chunksize` rows, as frames (X_*) or
+    1-D arrays (y_*), without reading the whole file: .npy files are
+    memory-mapped and sliced, CSV files are read with a chunked reader
+    """
+    if fmt == "auto":
+        fmt = "npy" if _has_npy(split_path, [name]) else "csv"
+
+    path = os.path.join(split_path, name + "." + fmt)
+    if not os.path.exists(path):
+        raise FileNotFoundError("❌ %s not found in %s! Run feature_engineering.py first." % (name, split_path))
+
+    if fmt == "csv":
+        chunks = pd.read_csv(path, dtype=read_dtypes(), chunksize=chunksize)
+    else:
+        with open(os.path.join(split_path, SCHEMA_FILE)) as f:
+            schema = json.load(f)[name]
+        values = np.load(path, mmap_mode="r")
+        chunks = (
+            _with_dtypes(pd.DataFrame(values[start:start + chunksize], columns=schema["columns"]),
+                         schema["dtypes"])
+            for start in range(0, len(values), chunksize)
+        )
+
+    for chunk in chunks:
+        yield chunk.to_numpy().ravel() if name.startswith("y_") else chunk
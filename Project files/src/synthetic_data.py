@@ -0,0 +1,140 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, "..", "data", "raw", "startup data.csv")
+OUTPUT_DIR = os.path.join(BASE_DIR, "..", "data", "raw")
+
+# ---------------------------------
+# Column Groups
+# ---------------------------------
+# Columns that only make sense together are resampled as one block (a
+# real row's location, its category flags, its outcome), so the state and
+# category mixes match the real file and is_CA always agrees with state_code
+BLOCKS = {
+    "location": ['state_code', 'state_code.1', 'latitude', 'longitude', 'zip_code',
+                 'city', 'Unnamed: 6', 'is_CA', 'is_NY', 'is_MA', 'is_TX', 'is_otherstate'],
+    "category": ['category_code', 'is_software', 'is_web', 'is_mobile', 'is_enterprise',
+                 'is_advertising', 'is_gamesvideo', 'is_ecommerce', 'is_biotech',
+                 'is_consulting', 'is_othercategory'],
+    "outcome": ['status', 'labels'],
+}
+
+# Identifiers are generated, never resampled
+UNIQUE_COLUMNS = {'id': "c:%d", 'object_id': "c:%d", 'name': "Startup %d"}
+ROW_NUMBER = 'Unnamed: 0'
+
+# Numeric columns with more distinct values than this are drawn from their
+# interpolated quantile function instead of their observed values
+CONTINUOUS_MIN_UNIQUE = 50
+
+DEFAULT_CHUNKSIZE = 500_000
+
+
+def fit_profile(data):
+    """
+    Learn the marginal distribution of every column of the real file
+    """
+    profile = {"columns": list(data.columns), "blocks": {}, "marginals": {}}
+    in_blocks = set()
+
+    for name, cols in BLOCKS.items():
+        cols = [c for c in cols if c in data.columns]
+        profile["blocks"][name] = data[cols].reset_index(drop=True)
+        in_blocks.update(cols)
+
+    for col in data.columns:
+        if col in in_blocks or col in UNIQUE_COLUMNS or col == ROW_NUMBER:
+            continue
+
+        series = data[col]
+        if pd.api.types.is_numeric_dtype(series) and series.nunique() > CONTINUOUS_MIN_UNIQUE:
+            profile["marginals"][col] = {
+                "kind": "quantiles",
+                "sorted": np.sort(series.dropna().to_numpy(dtype=np.float64)),
+                "nan_rate": float(series.isna().mean()),
+                "integer": pd.api.types.is_integer_dtype(series),
+            }
+        else:
+            freq = series.value_counts(normalize=True, dropna=False)
+            profile["marginals"][col] = {
+                "kind": "values",
+                "values": freq.index.to_numpy(dtype=object),
+                "p": freq.to_numpy(),
+            }
+
+    return profile
+
+
+def sample_marginal(spec, n_rows, rng):
+    if spec["kind"] == "values":
+        return rng.choice(spec["values"], size=n_rows, p=spec["p"])
+
+    # Inverse CDF: linear interpolation between the observed order statistics
+    values = spec["sorted"]
+    positions = rng.random(n_rows) * (len(values) - 1)
+    sample = np.interp(positions, np.arange(len(values)), values)
+
+    if spec["integer"]:
+        sample = np.round(sample)
+    if spec["nan_rate"]:
+        sample[rng.random(n_rows) < spec["nan_rate"]] = np.nan
+    elif spec["integer"]:
+        sample = sample.astype(np.int64)
+    return sample
+
+
+def generate(profile, n_rows, rng, start=0):
+    """
+    One synthetic frame with the real file's columns, in the same order.
+    `start` offsets the row numbers and identifiers of this chunk.
+    """
+    columns = {}
+    for block in profile["blocks"].values():
+        rows = block.iloc[rng.integers(len(block), size=n_rows)].reset_index(drop=True)
+        columns.update({col: rows[col] for col in rows.columns})
+
+    for col, spec in profile["marginals"].items():
+        columns[col] = sample_marginal(spec, n_rows, rng)
+
+    numbers = np.arange(start, start + n_rows)
+    for col, pattern in UNIQUE_COLUMNS.items():
+        columns[col] = [pattern % i for i in numbers]
+    columns[ROW_NUMBER] = numbers
+
+    return pd.DataFrame({col: columns[col] for col in profile["columns"] if col in columns})
+
+
+def write_synthetic(output_path, n_rows, seed=0, chunksize=DEFAULT_CHUNKSIZE, source=DATA_PATH):
+    """
+    Stream n_rows synthetic rows to a CSV with the raw file's schema.
+    Memory is bounded by chunksize; the same seed and chunksize always
+    produce the same file.
+    """
+    profile = fit_profile(pd.read_csv(source))
+    start = time.perf_counter()
+
+    for i, offset in enumerate(range(0, n_rows, chunksize)):
+        rng = np.random.default_rng([seed, i])
+        chunk = generate(profile, min(chunksize, n_rows - offset), rng, start=offset)
+        chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+
+    print("✅ %d synthetic rows written to %s in %.2fs" % (n_rows, output_path, time.perf_counter() - start))
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset shaped like the raw startup file")
+    parser.add_argument("rows", type=int, help="number of rows to generate")
+    parser.add_argument("--output", default=None,
+                        help="CSV path (default: data/raw/synthetic_<rows>.csv)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(OUTPUT_DIR, "synthetic_%d.csv" % args.rows)
+    write_synthetic(output, args.rows, seed=args.seed, chunksize=args.chunksize)
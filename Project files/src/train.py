@@ -1,44 +1,181 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+import json
+import hashlib
 import joblib
+import time
+import warnings
+import argparse
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
 from sklearn.model_selection import cross_val_score
 
+from feature_transformer import FeatureTransformer
+from histogram_boosting import ReservoirSample, StreamingBoostingClassifier
+from split_io import load_split, iter_split
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SPLIT_PATH = os.path.join(BASE_DIR, "..", "data", "split")
 MODEL_PATH = os.path.join(BASE_DIR, "..", "models")
+REPORT_PATH = os.path.join(BASE_DIR, "..", "reports")
+
+# Compact serving artifact, loaded by backend/ml_model.py when present
+COMPACT_PATH = os.path.join(MODEL_PATH, "model_compact.npz")
+
+# Training distributions the serving drift monitor compares traffic against
+DRIFT_REFERENCE_PATH = os.path.join(MODEL_PATH, "drift_reference.json")
 
 os.makedirs(MODEL_PATH, exist_ok=True)
 
-def train_model():
-    # Check if split files exist
-    x_train_path = os.path.join(SPLIT_PATH, "X_train.csv")
-    x_test_path = os.path.join(SPLIT_PATH, "X_test.csv")
-    y_train_path = os.path.join(SPLIT_PATH, "y_train.csv")
-    y_test_path = os.path.join(SPLIT_PATH, "y_test.csv")
+# The array-backed forest lives with the serving code
+sys.path.insert(0, os.path.join(BASE_DIR, "..", "backend"))
+from compiled_forest import CompiledForest
+from drift import build_reference, save_reference
 
-    if not os.path.exists(x_train_path):
-        raise FileNotFoundError("❌ X_train.csv not found! Run feature_engineering.py first.")
+# Forest sizes at which the OOB score is checked in grow mode
+GROWTH_CHECKPOINTS = [25, 50, 75, 100, 150, 200, 250, 300]
 
-    # Load data
-    X_train = pd.read_csv(x_train_path)
-    X_test = pd.read_csv(x_test_path)
-    y_train = pd.read_csv(y_train_path).values.ravel()
-    y_test = pd.read_csv(y_test_path).values.ravel()
+# Smallest forest whose OOB score is within this of the best one wins
+OOB_TOLERANCE = 0.005
+
+# Rows per chunk in out-of-core mode
+OUT_OF_CORE_CHUNKSIZE = 100_000
 
-    print("Training Data Shape:", X_train.shape)
 
-    # Model
+def grow_forest(X_train, y_train, checkpoints=GROWTH_CHECKPOINTS, tolerance=OOB_TOLERANCE):
+    """
+    Grow one forest with warm_start, adding trees up to each checkpoint and
+    recording the out-of-bag score, instead of refitting from scratch for
+    every tree count. The forest is then cut back to the smallest checkpoint
+    within `tolerance` of the best OOB score; with warm_start the first k
+    trees are exactly the forest a fresh k-tree fit would produce.
+    """
     model = RandomForestClassifier(
-        n_estimators=200,
+        n_estimators=checkpoints[0],
         random_state=42,
-        class_weight='balanced'
+        class_weight='balanced',
+        warm_start=True,
+        oob_score=True
     )
 
-    # Train
-    model.fit(X_train, y_train)
+    history = []
+    start = time.perf_counter()
+    for n_trees in checkpoints:
+        model.set_params(n_estimators=n_trees)
+        with warnings.catch_warnings():
+            # Every round refits on the same full training set, which is the
+            # case the balanced-class_weight/warm_start warning allows for
+            warnings.filterwarnings("ignore", message=".*class_weight presets.*")
+            model.fit(X_train, y_train)
+
+        history.append({
+            "n_estimators": n_trees,
+            "oob_score": model.oob_score_,
+            "cumulative_train_s": time.perf_counter() - start,
+        })
+        print("Trees: %3d  OOB Score: %.4f" % (n_trees, model.oob_score_))
+
+    history = pd.DataFrame(history)
+    best_score = history["oob_score"].max()
+    chosen = history[history["oob_score"] >= best_score - tolerance].iloc[0]
+    n_trees = int(chosen["n_estimators"])
+
+    model.estimators_ = model.estimators_[:n_trees]
+    model.set_params(n_estimators=n_trees, warm_start=False)
+    model.oob_score_ = float(chosen["oob_score"])
+    # The per-sample OOB votes were computed for the full-size forest
+    del model.oob_decision_function_
+
+    print("Selected %d trees (OOB %.4f, best %.4f)" % (n_trees, chosen["oob_score"], best_score))
+
+    return model, history
+
+
+def export_compact(model_file, X_check):
+    """
+    Export the pickled forest as a compressed, pruned .npz artifact and
+    report its size, load time and prediction parity against the pickle
+    """
+    start = time.perf_counter()
+    model = joblib.load(model_file)
+    pickle_load_s = time.perf_counter() - start
+
+    if not hasattr(model, "estimators_"):
+        print("Model is not a tree ensemble, skipping compact export")
+        return None
+
+    with open(model_file, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+
+    full = CompiledForest.from_estimator(model)
+    compact = full.compact()
+    compact.save_npz(COMPACT_PATH, source_sha256=digest)
+
+    start = time.perf_counter()
+    loaded, _ = CompiledForest.load_npz(COMPACT_PATH)
+    compact_load_s = time.perf_counter() - start
+
+    expected = model.predict_proba(X_check)
+    actual = loaded.predict_proba(X_check)
+
+    report = {
+        "pickle_bytes": os.path.getsize(model_file),
+        "compact_bytes": os.path.getsize(COMPACT_PATH),
+        "pickle_load_s": pickle_load_s,
+        "compact_load_s": compact_load_s,
+        "nodes": len(full.left),
+        "nodes_after_pruning": len(compact.left),
+        "subtrees_pruned": compact.n_pruned,
+        "parity_rows": len(X_check),
+        "max_abs_proba_diff": float(np.abs(expected - actual).max()),
+        "label_agreement": float((expected.argmax(axis=1) == actual.argmax(axis=1)).mean()),
+    }
+
+    os.makedirs(REPORT_PATH, exist_ok=True)
+    with open(os.path.join(REPORT_PATH, "compact_model.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+    print("\n✅ Compact artifact saved:", COMPACT_PATH)
+    print("   Size: %.2f MB -> %.2f MB" % (report["pickle_bytes"] / 1e6, report["compact_bytes"] / 1e6))
+    print("   Load: %.1f ms -> %.1f ms" % (pickle_load_s * 1e3, compact_load_s * 1e3))
+    print("   Nodes: %d -> %d (%d subtrees pruned)" % (report["nodes"], report["nodes_after_pruning"], report["subtrees_pruned"]))
+    print("   Parity on %d rows: max |Δp| = %g, labels agree %.2f%%" % (
+        len(X_check), report["max_abs_proba_diff"], report["label_agreement"] * 100))
+
+    return report
+
+
+def train_model(grow=False):
+    # Load data (.npy split files are memory-mapped, CSV is the fallback)
+    split = load_split(SPLIT_PATH)
+    X_train, X_test = split["X_train"], split["X_test"]
+    y_train, y_test = split["y_train"], split["y_test"]
+
+    print("Training Data Shape:", X_train.shape)
+
+    # Fitted once here and shipped with the model so serving builds the
+    # exact same float32 matrix
+    transformer = FeatureTransformer().fit(X_train)
+    X_train = transformer.transform(X_train)
+    X_test = transformer.transform(X_test)
+
+    if grow:
+        # Single pass along n_estimators, scored out-of-bag
+        model, history = grow_forest(X_train, y_train)
+        os.makedirs(REPORT_PATH, exist_ok=True)
+        history.to_csv(os.path.join(REPORT_PATH, "forest_growth.csv"), index=False)
+    else:
+        # Model
+        model = RandomForestClassifier(
+            n_estimators=200,
+            random_state=42,
+            class_weight='balanced'
+        )
+
+        # Train
+        model.fit(X_train, y_train)
     print("✅ Model Training Completed.")
 
     # Predict
@@ -52,14 +189,92 @@ def train_model():
     # Save model
     joblib.dump(model, os.path.join(MODEL_PATH, "startup_success_model.pkl"))
 
-    # Save feature columns (IMPORTANT for API)
-    joblib.dump(X_train.columns.tolist(), os.path.join(MODEL_PATH, "feature_columns.pkl"))
+    # Save feature columns and transformer (IMPORTANT for API)
+    joblib.dump(transformer.columns_, os.path.join(MODEL_PATH, "feature_columns.pkl"))
+    joblib.dump(transformer, os.path.join(MODEL_PATH, "feature_transformer.pkl"))
+
+    print("✅ Model, feature columns and transformer saved in models/")
+
+    export_compact(os.path.join(MODEL_PATH, "startup_success_model.pkl"), np.vstack([X_train, X_test]))
+
+    save_reference(DRIFT_REFERENCE_PATH, build_reference(X_train, transformer.columns_))
+    print("✅ Drift reference saved:", DRIFT_REFERENCE_PATH)
+
+    # Cross Validation (grow mode already has the OOB estimate)
+    if grow:
+        print("OOB Score:", model.oob_score_)
+    else:
+        cv_scores = cross_val_score(model, X_train, y_train, cv=5)
+        print("CV Score:", cv_scores.mean())
+
+
+def train_out_of_core(chunksize=OUT_OF_CORE_CHUNKSIZE):
+    """
+    Train without loading the split into memory: X_train/y_train are
+    streamed in chunks, binned into uint8 codes and used to fit a
+    histogram gradient-boosted model. Saves the same model, feature
+    columns and transformer files as train_model; the compact export is
+    for forests only, and the drift reference comes from a row sample.
+    """
+    transformer = FeatureTransformer().fit(next(iter_split(SPLIT_PATH, "X_train", chunksize=1)))
 
-    print("✅ Model and feature columns saved in models/")
+    def chunks():
+        return (
+            (transformer.transform(X), y)
+            for X, y in zip(iter_split(SPLIT_PATH, "X_train", chunksize),
+                            iter_split(SPLIT_PATH, "y_train", chunksize))
+        )
 
-    # Cross Validation
-    cv_scores = cross_val_score(model, X_train, y_train, cv=5)
-    print("CV Score:", cv_scores.mean())
+    sample = ReservoirSample()
+    model = StreamingBoostingClassifier(chunksize=chunksize)
+
+    start = time.perf_counter()
+    model.fit_stream(chunks, sample=sample)
+    print("Training Rows:", model.n_rows_, " Features:", model.n_features_in_)
+    print("✅ Model Training Completed in %.1fs." % (time.perf_counter() - start))
+
+    # Evaluation, streamed as well (only the labels are kept)
+    y_test, y_pred = [], []
+    for X, y in zip(iter_split(SPLIT_PATH, "X_test", chunksize), iter_split(SPLIT_PATH, "y_test", chunksize)):
+        y_test.append(y)
+        y_pred.append(model.predict(transformer.transform(X)))
+    y_test, y_pred = np.concatenate(y_test), np.concatenate(y_pred)
+
+    print("\nAccuracy:", accuracy_score(y_test, y_pred))
+    print("\nConfusion Matrix:\n", confusion_matrix(y_test, y_pred))
+    print("\nClassification Report:\n", classification_report(y_test, y_pred))
+
+    joblib.dump(model, os.path.join(MODEL_PATH, "startup_success_model.pkl"))
+    joblib.dump(transformer.columns_, os.path.join(MODEL_PATH, "feature_columns.pkl"))
+    joblib.dump(transformer, os.path.join(MODEL_PATH, "feature_transformer.pkl"))
+
+    print("✅ Model, feature columns and transformer saved in models/")
+
+    save_reference(DRIFT_REFERENCE_PATH, build_reference(sample.values, transformer.columns_))
+    print("✅ Drift reference saved:", DRIFT_REFERENCE_PATH)
 
 if __name__ == "__main__":
-    train_model()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the startup success model")
+    parser.add_argument("--grow", action="store_true",
+                        help="grow one warm-started forest and pick its size by OOB score")
+    parser.add_argument("--out-of-core", action="store_true",
+                        help="stream the split in chunks and train a histogram gradient-boosted "
+                             "model, for training sets larger than memory")
+    parser.add_argument("--chunksize", type=int, default=OUT_OF_CORE_CHUNKSIZE,
+                        help="rows per chunk in --out-of-core mode")
+    parser.add_argument("--export-only", action="store_true",
+                        help="only export the serving artifacts (compact model, drift reference) "
+                             "for the existing models/model.pkl")
+    args = parser.parse_args()
+
+    if args.export_only:
+        split = load_split(SPLIT_PATH, names=["X_train", "X_test"])
+        X_check = np.vstack([split["X_train"].to_numpy(np.float32), split["X_test"].to_numpy(np.float32)])
+        export_compact(os.path.join(MODEL_PATH, "model.pkl"), X_check)
+        save_reference(DRIFT_REFERENCE_PATH,
+                       build_reference(split["X_train"].to_numpy(np.float32), split["X_train"].columns))
+        print("✅ Drift reference saved:", DRIFT_REFERENCE_PATH)
+    elif args.out_of_core:
+        train_out_of_core(chunksize=args.chunksize)
+    else:
+        train_model(grow=args.grow)
\ No newline at end of file